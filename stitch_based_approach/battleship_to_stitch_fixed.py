@@ -283,6 +283,18 @@ def convert_program(code: str) -> tuple[Optional[str], Set[str]]:
     """
     try:
         tree = ast.parse(code)
+    except (SyntaxError, ValueError):
+        return None, set()
+    return convert_program_ast(tree)
+
+
+def convert_program_ast(tree: ast.AST) -> tuple[Optional[str], Set[str]]:
+    """Convert an already-parsed Python module to Stitch s-expression.
+
+    Returns:
+        (sexp_string, free_variables_found)
+    """
+    try:
         converter = StitchConverter()
         term = converter.visit(tree)
         if term:
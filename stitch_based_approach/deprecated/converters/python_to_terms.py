@@ -6,25 +6,87 @@ via anti-unification. We'll convert Python ASTs to a simplified term language.
 """
 import ast
 import json
-from typing import Any, List, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, ClassVar, Dict, List, Optional, Tuple
 from dataclasses import dataclass
 
+try:
+    import orjson
+except ImportError:  # fall back to the stdlib encoder
+    orjson = None
+
+
+def load_json(path: str) -> Any:
+    """Load a JSON file, using orjson when it is installed."""
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def dump_json(obj: Any, path: str):
+    """Write obj to path as indented JSON, using orjson when it is installed."""
+    if orjson is not None:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+    else:
+        with open(path, 'w') as f:
+            json.dump(obj, f, indent=2)
+
+
+def _intern_key(arg: Any) -> Any:
+    """Hashable key for a term argument; child terms are keyed by identity."""
+    if isinstance(arg, Term):
+        return id(arg)
+    if isinstance(arg, list):
+        return tuple(_intern_key(a) for a in arg)
+    return arg
+
 
 @dataclass
 class Term:
-    """A term in our intermediate representation."""
+    """
+    A term in our intermediate representation.
+
+    Child terms live in args; primitive arguments (names, constants) live
+    in leaf, so code walking the tree never has to type-check each arg.
+    """
     op: str
-    args: List[Any]
+    args: Tuple['Term', ...] = ()
+    leaf: Tuple[Any, ...] = ()
+
+    # Hash-cons table: structurally equal terms built via mk() share one object
+    _table: ClassVar[Dict[Tuple, 'Term']] = {}
+
+    @classmethod
+    def mk(cls, op: str, args: List[Any]) -> 'Term':
+        """
+        Build a term, reusing the existing object if an equal one was made.
+
+        Term arguments become children and everything else becomes a leaf.
+        Child terms are keyed by identity, so they must come from mk() too.
+        """
+        children = tuple(a for a in args if isinstance(a, Term))
+        leaf = tuple(a for a in args if not isinstance(a, Term))
+        key = (op, tuple(map(id, children)), _intern_key(list(leaf)))
+        term = cls._table.get(key)
+        if term is None:
+            term = cls._table[key] = cls(op, children, leaf)
+        return term
+
+    def __reduce__(self):
+        # Re-intern on unpickling so terms returned by worker processes
+        # are shared with the ones already built in this process
+        return (Term.mk, (self.op, self.args + self.leaf))
 
     def to_sexp(self) -> str:
         """Convert to s-expression format."""
-        if not self.args:
+        if not self.args and not self.leaf:
             return self.op
-        args_str = ' '.join(
-            arg.to_sexp() if isinstance(arg, Term) else str(arg)
-            for arg in self.args
-        )
-        return f"({self.op} {args_str})"
+        parts = [arg.to_sexp() for arg in self.args]
+        parts.extend(str(value) for value in self.leaf)
+        return f"({self.op} {' '.join(parts)})"
 
     def __repr__(self):
         return self.to_sexp()
@@ -39,45 +101,45 @@ class PythonToTerms(ast.NodeVisitor):
     def visit_Module(self, node):
         """Top-level module."""
         body_terms = [self.visit(stmt) for stmt in node.body]
-        return Term('module', body_terms)
+        return Term.mk('module', body_terms)
 
     def visit_FunctionDef(self, node):
         """Function definition."""
         args = [arg.arg for arg in node.args.args]
         body = [self.visit(stmt) for stmt in node.body]
-        return Term('defun', [node.name, args, body])
+        return Term.mk('defun', [node.name, args, body])
 
     def visit_Return(self, node):
         """Return statement."""
-        value = self.visit(node.value) if node.value else Term('none', [])
-        return Term('return', [value])
+        value = self.visit(node.value) if node.value else Term.mk('none', [])
+        return Term.mk('return', [value])
 
     def visit_Assign(self, node):
         """Assignment."""
         targets = [self.visit(t) for t in node.targets]
         value = self.visit(node.value)
-        return Term('assign', [targets[0], value])
+        return Term.mk('assign', [targets[0], value])
 
     def visit_AnnAssign(self, node):
         """Annotated assignment."""
         target = self.visit(node.target)
-        value = self.visit(node.value) if node.value else Term('none', [])
-        return Term('assign', [target, value])
+        value = self.visit(node.value) if node.value else Term.mk('none', [])
+        return Term.mk('assign', [target, value])
 
     def visit_Name(self, node):
         """Variable name."""
-        return Term('var', [node.id])
+        return Term.mk('var', [node.id])
 
     def visit_Constant(self, node):
         """Constant value."""
-        return Term('const', [repr(node.value)])
+        return Term.mk('const', [repr(node.value)])
 
     def visit_BinOp(self, node):
         """Binary operation."""
         left = self.visit(node.left)
         right = self.visit(node.right)
         op_name = node.op.__class__.__name__.lower()
-        return Term(op_name, [left, right])
+        return Term.mk(op_name, [left, right])
 
     def visit_Compare(self, node):
         """Comparison."""
@@ -85,7 +147,7 @@ class PythonToTerms(ast.NodeVisitor):
         # Simplify: only handle first comparison
         op = node.ops[0].__class__.__name__.lower()
         right = self.visit(node.comparators[0])
-        return Term(op, [left, right])
+        return Term.mk(op, [left, right])
 
     def visit_BoolOp(self, node):
         """Boolean operation (and/or)."""
@@ -94,25 +156,25 @@ class PythonToTerms(ast.NodeVisitor):
         # Chain binary operations
         result = values[0]
         for v in values[1:]:
-            result = Term(op_name, [result, v])
+            result = Term.mk(op_name, [result, v])
         return result
 
     def visit_Call(self, node):
         """Function call."""
         func = self.visit(node.func)
         args = [self.visit(arg) for arg in node.args]
-        return Term('call', [func] + args)
+        return Term.mk('call', [func] + args)
 
     def visit_Attribute(self, node):
         """Attribute access (e.g., np.array)."""
         value = self.visit(node.value)
-        return Term('attr', [value, node.attr])
+        return Term.mk('attr', [value, node.attr])
 
     def visit_Subscript(self, node):
         """Subscripting (array indexing)."""
         value = self.visit(node.value)
         slice_term = self.visit(node.slice)
-        return Term('subscript', [value, slice_term])
+        return Term.mk('subscript', [value, slice_term])
 
     def visit_Index(self, node):
         """Index node."""
@@ -120,30 +182,30 @@ class PythonToTerms(ast.NodeVisitor):
 
     def visit_Slice(self, node):
         """Slice node."""
-        lower = self.visit(node.lower) if node.lower else Term('none', [])
-        upper = self.visit(node.upper) if node.upper else Term('none', [])
-        return Term('slice', [lower, upper])
+        lower = self.visit(node.lower) if node.lower else Term.mk('none', [])
+        upper = self.visit(node.upper) if node.upper else Term.mk('none', [])
+        return Term.mk('slice', [lower, upper])
 
     def visit_Tuple(self, node):
         """Tuple."""
         elts = [self.visit(e) for e in node.elts]
-        return Term('tuple', elts)
+        return Term.mk('tuple', elts)
 
     def visit_List(self, node):
         """List."""
         elts = [self.visit(e) for e in node.elts]
-        return Term('list', elts)
+        return Term.mk('list', elts)
 
     def visit_IfExp(self, node):
         """Ternary if expression."""
         test = self.visit(node.test)
         body = self.visit(node.body)
         orelse = self.visit(node.orelse)
-        return Term('if', [test, body, orelse])
+        return Term.mk('if', [test, body, orelse])
 
     def generic_visit(self, node):
         """Fallback for unhandled nodes."""
-        return Term('unknown', [node.__class__.__name__])
+        return Term.mk('unknown', [node.__class__.__name__])
 
 
 def python_to_term(code: str) -> Term:
@@ -163,9 +225,24 @@ def extract_function_body_term(code: str) -> Term:
             converter = PythonToTerms()
             # Convert body statements
             body_terms = [converter.visit(stmt) for stmt in node.body]
-            return Term('body', body_terms)
+            return Term.mk('body', body_terms)
+
+    return Term.mk('empty', [])
+
 
-    return Term('empty', [])
+def _convert_one(item: Tuple[int, Dict]) -> Tuple[Optional[Dict], Optional[str]]:
+    """Convert one (index, program) pair; runs inside a worker process."""
+    i, prog = item
+    try:
+        term = extract_function_body_term(prog['solution'])
+        return {
+            'id': prog.get('name', f'program_{i}'),
+            'description': prog['description'],
+            'term': term.to_sexp(),
+            'original_code': prog['solution']
+        }, None
+    except Exception as e:
+        return None, f"Error converting program {i}: {e}"
 
 
 def programs_to_terms_file(programs_file: str, output_file: str):
@@ -176,29 +253,22 @@ def programs_to_terms_file(programs_file: str, output_file: str):
 
     results = []
 
-    for i, prog in enumerate(programs):
-        try:
-            term = extract_function_body_term(prog['solution'])
-            results.append({
-                'id': prog.get('name', f'program_{i}'),
-                'description': prog['description'],
-                'term': term.to_sexp(),
-                'original_code': prog['solution']
-            })
-        except Exception as e:
-            print(f"Error converting program {i}: {e}")
-            continue
+    # Each conversion is independent, so fan them out across cores
+    with ProcessPoolExecutor() as executor:
+        for result, error in executor.map(_convert_one, enumerate(programs), chunksize=32):
+            if error:
+                print(error)
+                continue
+            results.append(result)
 
     # Save as JSON
-    with open(output_file, 'w') as f:
-        json.dump(results, f, indent=2)
+    dump_json(results, output_file)
 
     # Also save as plain s-expressions for Stitch
     sexp_file = output_file.replace('.json', '.sexp')
+    lines = [f";; {r['id']}: {r['description']}\n{r['term']}\n\n" for r in results]
     with open(sexp_file, 'w') as f:
-        for r in results:
-            f.write(f";; {r['id']}: {r['description']}\n")
-            f.write(f"{r['term']}\n\n")
+        f.writelines(lines)
 
     print(f"Converted {len(results)} programs to terms")
     print(f"Saved to: {output_file}")
@@ -9,11 +9,30 @@ Key concepts:
 2. Compression: Extract abstractions that minimize total program size
 3. Iteration: Repeatedly find and extract common patterns
 """
-import json
+import hashlib
+import re
+import sys
 from typing import List, Tuple, Dict, Set
 from dataclasses import dataclass
 from collections import defaultdict
-from python_to_terms import Term, python_to_term, extract_function_body_term
+from concurrent.futures import ProcessPoolExecutor
+from python_to_terms import Term, python_to_term, extract_function_body_term, load_json, dump_json
+
+try:
+    import xxhash
+except ImportError:  # fall back to an 8-byte blake2b digest
+    xxhash = None
+
+# ?v0 -> ?x and ?v1 -> ?y in a single pass
+_NORMALIZE_RE = re.compile(r'\?v([01])')
+_NORMALIZED_VARS = {'0': '?x', '1': '?y'}
+
+
+def _pattern_hash(text: str) -> int:
+    """64-bit digest of a normalized term string."""
+    if xxhash is not None:
+        return xxhash.xxh64(text).intdigest()
+    return int.from_bytes(hashlib.blake2b(text.encode(), digest_size=8).digest(), 'little')
 
 
 @dataclass
@@ -26,12 +45,33 @@ class Abstraction:
     compression_gain: int  # How many chars saved by using this
 
 
+def _body_term_or_none(code: str):
+    """Parse one program's body into a Term; runs inside a worker process."""
+    try:
+        return extract_function_body_term(code)
+    except Exception:
+        return None
+
+
 class StitchCompressor:
     """Implements Stitch-style compression via anti-unification."""
 
     def __init__(self):
         self.abstractions = []
         self.abstraction_counter = 0
+        # Interned ?vN names and their var terms, grown on demand and reused
+        self._var_pool: List[str] = []
+        self._var_terms: List[Term] = []
+
+    def _fresh_var(self) -> Tuple[str, Term]:
+        """Return the next fresh variable name and its shared var term."""
+        i = self.abstraction_counter
+        self.abstraction_counter += 1
+        if i == len(self._var_pool):
+            name = sys.intern(f"?v{i}")
+            self._var_pool.append(name)
+            self._var_terms.append(Term.mk('var', [name]))
+        return self._var_pool[i], self._var_terms[i]
 
     def anti_unify(self, t1: Term, t2: Term) -> Tuple[Term, Dict[str, Term], Dict[str, Term]]:
         """
@@ -44,49 +84,40 @@ class StitchCompressor:
             anti_unify((+ 1 2), (+ 3 4))
             => ((+ ?x ?y), {?x: 1, ?y: 2}, {?x: 3, ?y: 4})
         """
+        if t1 is t2:
+            # Hash-consed terms: identical subterms generalize to themselves
+            return t1, {}, {}
+
         if t1.op != t2.op:
             # Different operators -> create fresh variable
-            var_name = f"?v{self.abstraction_counter}"
-            self.abstraction_counter += 1
+            var_name, var_term = self._fresh_var()
             return (
-                Term('var', [var_name]),
+                var_term,
                 {var_name: t1},
                 {var_name: t2}
             )
 
-        if len(t1.args) != len(t2.args):
-            # Different arity -> create fresh variable
-            var_name = f"?v{self.abstraction_counter}"
-            self.abstraction_counter += 1
+        if len(t1.args) != len(t2.args) or t1.leaf != t2.leaf:
+            # Different arity or primitive leaves -> create fresh variable
+            var_name, var_term = self._fresh_var()
             return (
-                Term('var', [var_name]),
+                var_term,
                 {var_name: t1},
                 {var_name: t2}
             )
 
-        # Same operator -> recursively anti-unify arguments
+        # Same operator and leaves -> recursively anti-unify child terms
         gen_args = []
         sub1 = {}
         sub2 = {}
 
         for arg1, arg2 in zip(t1.args, t2.args):
-            if isinstance(arg1, Term) and isinstance(arg2, Term):
-                gen_arg, s1, s2 = self.anti_unify(arg1, arg2)
-                gen_args.append(gen_arg)
-                sub1.update(s1)
-                sub2.update(s2)
-            elif arg1 == arg2:
-                # Identical primitive arguments
-                gen_args.append(arg1)
-            else:
-                # Different primitives -> create variable
-                var_name = f"?v{self.abstraction_counter}"
-                self.abstraction_counter += 1
-                gen_args.append(Term('var', [var_name]))
-                sub1[var_name] = arg1
-                sub2[var_name] = arg2
-
-        return Term(t1.op, gen_args), sub1, sub2
+            gen_arg, s1, s2 = self.anti_unify(arg1, arg2)
+            gen_args.append(gen_arg)
+            sub1.update(s1)
+            sub2.update(s2)
+
+        return Term(t1.op, tuple(gen_args), t1.leaf), sub1, sub2
 
     def find_common_subterm(self, terms: List[Term], min_size: int = 10) -> Tuple[Term, List[int]]:
         """
@@ -95,13 +126,14 @@ class StitchCompressor:
         Returns:
             (generalized_subterm, list_of_term_indices_containing_it)
         """
-        # Extract all subterms from all terms
+        # Extract all subterms from all terms, sizing each one exactly once
         all_subterms = []
         for idx, term in enumerate(terms):
             subterms = self._extract_subterms(term)
             for sub in subterms:
-                if len(sub.to_sexp()) >= min_size:
-                    all_subterms.append((sub, idx))
+                size = len(sub.to_sexp())
+                if size >= min_size:
+                    all_subterms.append((sub, idx, size))
 
         if not all_subterms:
             return None, []
@@ -111,33 +143,31 @@ class StitchCompressor:
         best_gain = 0
         best_indices = []
 
-        for i, (sub1, idx1) in enumerate(all_subterms):
+        for i, (sub1, idx1, size1) in enumerate(all_subterms):
             matching_indices = {idx1}
-            generalizations = []
 
-            for sub2, idx2 in all_subterms[i+1:]:
+            for sub2, idx2, size2 in all_subterms[i+1:]:
+                # Variables never escape a single pair, so number them afresh
+                self.abstraction_counter = 0
                 gen, s1, s2 = self.anti_unify(sub1, sub2)
 
                 # Calculate compression gain
                 # Gain = (size(sub1) + size(sub2)) - (size(gen) + overhead)
-                original_size = len(sub1.to_sexp()) + len(sub2.to_sexp())
+                original_size = size1 + size2
                 generalized_size = len(gen.to_sexp())
                 overhead = 20  # Approximate overhead for function definition
 
                 gain = original_size - generalized_size - overhead
 
                 if gain > 0 and len(s1) <= 3:  # Limit parameters to keep it simple
-                    generalizations.append((gen, idx2, gain))
-
-            # Find best generalization for this subterm
-            for gen, idx2, gain in generalizations:
-                total_indices = matching_indices | {idx2}
-                total_gain = gain * len(total_indices)
+                    # Score the candidate as soon as it is generated
+                    total_indices = matching_indices | {idx2}
+                    total_gain = gain * len(total_indices)
 
-                if total_gain > best_gain:
-                    best_gain = total_gain
-                    best_abstraction = gen
-                    best_indices = list(total_indices)
+                    if total_gain > best_gain:
+                        best_gain = total_gain
+                        best_abstraction = gen
+                        best_indices = list(total_indices)
 
         return best_abstraction, best_indices
 
@@ -146,8 +176,7 @@ class StitchCompressor:
         subterms = [term]
 
         for arg in term.args:
-            if isinstance(arg, Term):
-                subterms.extend(self._extract_subterms(arg))
+            subterms.extend(self._extract_subterms(arg))
 
         return subterms
 
@@ -163,15 +192,12 @@ class StitchCompressor:
             List of discovered abstractions
         """
         # Parse terms
-        terms = []
-        for prog in programs:
-            try:
-                # Parse the s-expression back to Term
-                # For simplicity, we'll use the function body directly
-                term = extract_function_body_term(prog['original_code'])
-                terms.append(term)
-            except:
-                continue
+        # For simplicity, we re-derive each Term from the function body
+        # directly; programs are independent so this runs in a process pool
+        codes = [prog['original_code'] for prog in programs]
+        with ProcessPoolExecutor() as executor:
+            parsed = executor.map(_body_term_or_none, codes, chunksize=32)
+            terms = [term for term in parsed if term is not None]
 
         print(f"Compressing {len(terms)} programs...")
 
@@ -215,8 +241,8 @@ class StitchCompressor:
 
         def collect_vars(t):
             if isinstance(t, Term):
-                if t.op == 'var' and t.args and str(t.args[0]).startswith('?'):
-                    params.add(t.args[0])
+                if t.op == 'var' and t.leaf and str(t.leaf[0]).startswith('?'):
+                    params.add(t.leaf[0])
                 for arg in t.args:
                     collect_vars(arg)
 
@@ -250,7 +276,10 @@ def analyze_term_patterns(programs: List[Dict]):
 
     # Count term operators
     op_counts = defaultdict(int)
+    # Bucket programs by a digest of their normalized term rather than
+    # keying on the (potentially huge) string itself
     term_hashes = defaultdict(list)
+    pattern_samples = {}
 
     for prog in programs:
         term_str = prog['term']
@@ -260,8 +289,10 @@ def analyze_term_patterns(programs: List[Dict]):
             op_counts[op] += term_str.count(f'({op} ')
 
         # Hash normalized terms
-        normalized = term_str.replace('?v0', '?x').replace('?v1', '?y')
-        term_hashes[normalized].append(prog['id'])
+        normalized = _NORMALIZE_RE.sub(lambda m: _NORMALIZED_VARS[m.group(1)], term_str)
+        digest = _pattern_hash(normalized)
+        term_hashes[digest].append(prog['id'])
+        pattern_samples.setdefault(digest, normalized[:100])
 
     print("Term operator frequency:")
     for op, count in sorted(op_counts.items(), key=lambda x: -x[1])[:15]:
@@ -269,9 +300,9 @@ def analyze_term_patterns(programs: List[Dict]):
 
     print(f"\nUnique term patterns: {len(term_hashes)}")
     print("\nMost common patterns:")
-    for i, (pattern, progs) in enumerate(sorted(term_hashes.items(), key=lambda x: -len(x[1]))[:5], 1):
+    for i, (digest, progs) in enumerate(sorted(term_hashes.items(), key=lambda x: -len(x[1]))[:5], 1):
         print(f"  {i}. Appears in {len(progs)} programs")
-        print(f"     Pattern: {pattern[:100]}...")
+        print(f"     Pattern: {pattern_samples[digest]}...")
 
 
 def main():
@@ -282,8 +313,7 @@ def main():
     print("="*70)
 
     # Load terms
-    with open('programs_as_terms.json', 'r') as f:
-        programs = json.load(f)
+    programs = load_json('programs_as_terms.json')
 
     print(f"\nLoaded {len(programs)} programs as terms\n")
 
@@ -329,8 +359,7 @@ def main():
         ]
     }
 
-    with open('stitch_results.json', 'w') as f:
-        json.dump(results, f, indent=2)
+    dump_json(results, 'stitch_results.json')
 
     print("\n" + "="*70)
     print("✓ Stitch compression complete")
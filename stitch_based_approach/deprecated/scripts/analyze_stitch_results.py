@@ -5,11 +5,37 @@ import json
 import re
 from typing import List, Dict
 
+try:
+    import orjson
+except ImportError:  # fall back to the stdlib encoder
+    orjson = None
+
+# De Bruijn argument references (#0, #1, ...) in an abstraction body
+_ARG_INDEX_RE = re.compile(r'#(\d+)')
+
+
+def load_json(path: str):
+    """Load a JSON file, using orjson when it is installed."""
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def dump_json(obj, path: str):
+    """Write obj to path as indented JSON, using orjson when it is installed."""
+    if orjson is not None:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+    else:
+        with open(path, 'w') as f:
+            json.dump(obj, f, indent=2)
+
 
 def parse_stitch_output(output_file: str) -> Dict:
     """Parse Stitch output JSON."""
-    with open(output_file, 'r') as f:
-        return json.load(f)
+    return load_json(output_file)
 
 
 def sexp_to_python_sketch(sexp: str, abstraction_name: str) -> str:
@@ -19,11 +45,9 @@ def sexp_to_python_sketch(sexp: str, abstraction_name: str) -> str:
     This is a rough conversion - the actual implementation would need
     to be filled in based on the pattern.
     """
-    # Count arity from #0, #1, etc.
-    arity = 0
-    for i in range(10):
-        if f'#{i}' in sexp:
-            arity = i + 1
+    # Arity is one past the highest #N referenced
+    indices = _ARG_INDEX_RE.findall(sexp)
+    arity = max(map(int, indices)) + 1 if indices else 0
 
     params = ', '.join(f'arg{i}' for i in range(arity))
 
@@ -41,13 +65,15 @@ def sexp_to_python_sketch(sexp: str, abstraction_name: str) -> str:
 def generate_stitch_library(stitch_output: Dict) -> str:
     """Generate Python library from Stitch abstractions."""
 
-    code = "# Stitch-Discovered Helper Library\n"
-    code += "# Auto-generated from compression results\n"
-    code += "import numpy as np\n\n"
+    parts = [
+        "# Stitch-Discovered Helper Library\n",
+        "# Auto-generated from compression results\n",
+        "import numpy as np\n\n",
+    ]
 
     if 'inventions' not in stitch_output:
-        code += "# No abstractions discovered\n"
-        return code
+        parts.append("# No abstractions discovered\n")
+        return ''.join(parts)
 
     for inv in stitch_output['inventions']:
         name = inv.get('name', 'helper')
@@ -57,18 +83,20 @@ def generate_stitch_library(stitch_output: Dict) -> str:
 
         params = ', '.join(f'arg{i}' for i in range(arity))
 
-        code += f"def {name}({params}):\n"
-        code += f'    """\n'
-        code += f'    Discovered by Stitch compression.\n'
-        code += f'    Used in {uses} programs.\n'
-        code += f'    Arity: {arity}\n'
-        code += f'    Pattern: {body[:80]}...\n'
-        code += f'    """\n'
-        code += f'    # Implementation would be derived from:\n'
-        code += f'    # {body}\n'
-        code += f'    pass\n\n'
+        parts.append(
+            f"def {name}({params}):\n"
+            f'    """\n'
+            f'    Discovered by Stitch compression.\n'
+            f'    Used in {uses} programs.\n'
+            f'    Arity: {arity}\n'
+            f'    Pattern: {body[:80]}...\n'
+            f'    """\n'
+            f'    # Implementation would be derived from:\n'
+            f'    # {body}\n'
+            f'    pass\n\n'
+        )
 
-    return code
+    return ''.join(parts)
 
 
 def analyze_compression_results(iterations: List[int]):
@@ -86,8 +114,7 @@ def analyze_compression_results(iterations: List[int]):
         output_file = f"{output_dir}/out.json"
 
         try:
-            with open(output_file, 'r') as f:
-                data = json.load(f)
+            data = load_json(output_file)
 
             inventions = data.get('inventions', [])
 
@@ -145,8 +172,7 @@ def analyze_compression_results(iterations: List[int]):
               f"{summary['original_cost']:<12} {summary['final_cost']:<12} {comp_str:<12}")
 
     # Save summary
-    with open('stitch_compression_summary.json', 'w') as f:
-        json.dump(results_summary, f, indent=2)
+    dump_json(results_summary, 'stitch_compression_summary.json')
 
     print()
     print("✓ Analysis complete")
@@ -4,6 +4,81 @@ Create very simple lambda calculus examples that Stitch can definitely handle.
 This will test if Stitch Python bindings work at all.
 """
 import json
+from array import array
+
+try:
+    import orjson
+except ImportError:  # fall back to the stdlib encoder
+    orjson = None
+
+
+def dump_json(obj, path: str, indent: bool = True):
+    """
+    Write obj to path as JSON, using orjson when it is installed.
+
+    Indented by default; indent=False writes it on one line with no spaces.
+    """
+    if orjson is not None:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0))
+    else:
+        with open(path, 'w') as f:
+            if indent:
+                json.dump(obj, f, indent=2)
+            else:
+                json.dump(obj, f, separators=(',', ':'))
+
+
+# Compact token encoding: parens and primitives get fixed ids, and an
+# integer literal (De Bruijn index or constant) is written as LITERAL
+# followed by its value, so literals never collide with token ids
+TOKENS = ('(', ')', 'lam', 'app', 'add', 'sub', 'mul', 'div',
+          'gt', 'lt', 'gte', 'lte', 'eq', 'ne', 'and', 'or', 'not')
+TOKEN_IDS = {tok: i for i, tok in enumerate(TOKENS)}
+LITERAL = len(TOKENS)
+
+# Literal values must fit in one array('i') item
+LITERAL_MAX = 2 ** (8 * array('i').itemsize - 1) - 1
+LITERAL_MIN = -LITERAL_MAX - 1
+
+
+def encode_program(program: str) -> array:
+    """Encode an s-expression as a flat int array of token ids and tagged literals."""
+    codes = array('i')
+    for tok in program.replace('(', ' ( ').replace(')', ' ) ').split():
+        if tok in TOKEN_IDS:
+            codes.append(TOKEN_IDS[tok])
+            continue
+        try:
+            value = int(tok)
+        except ValueError:
+            raise ValueError(f"Unknown token {tok!r} in {program!r}") from None
+        if not LITERAL_MIN <= value <= LITERAL_MAX:
+            raise ValueError(f"Literal {value} is out of range for the token encoding")
+        codes.append(LITERAL)
+        codes.append(value)
+    return codes
+
+
+def decode_program(codes) -> str:
+    """Rebuild the s-expression string from its token ids in a single pass."""
+    out = []
+    codes = iter(codes)
+    for code in codes:
+        if code == LITERAL:
+            value = next(codes, None)
+            if value is None:
+                raise ValueError("Literal tag at the end of the token array")
+            tok = str(value)
+        elif 0 <= code < LITERAL:
+            tok = TOKENS[code]
+        else:
+            raise ValueError(f"Unknown token id {code}")
+        if tok != ')' and out and out[-1] != '(':
+            out.append(' ')
+        out.append(tok)
+    return ''.join(out)
+
 
 # Create simple programs that should work
 simple_programs = [
@@ -70,11 +145,18 @@ simple_programs = [
 
 # Save to file
 output_file = 'simple_test.json'
-with open(output_file, 'w') as f:
-    json.dump(simple_programs, f, indent=2)
+dump_json(simple_programs, output_file)
+
+# Also save the compact token form alongside the Stitch input
+encoded_programs = [encode_program(prog) for prog in simple_programs]
+assert all(decode_program(codes) == prog for codes, prog in zip(encoded_programs, simple_programs))
+
+tokens_file = 'simple_test_tokens.json'
+dump_json([codes.tolist() for codes in encoded_programs], tokens_file, indent=False)
 
 print(f"✓ Created {len(simple_programs)} simple test programs")
 print(f"✓ Saved to {output_file}")
+print(f"✓ Token-encoded copy saved to {tokens_file}")
 print()
 print("Example programs:")
 for i, prog in enumerate(simple_programs[:5], 1):
@@ -6,23 +6,47 @@ This solves the free variable problem by symbolically inlining all local assignm
 before converting to lambda calculus.
 """
 import ast
-import json
+import contextlib
+import functools
+import hashlib
+import mmap
+import os
+import re
+import shelve
 import sys
-from typing import Dict, Optional
+from graphlib import CycleError, TopologicalSorter
+from multiprocessing import Pool
+from typing import Dict, Optional, Set, Tuple
+
+from json_io import dumps, loads
 
 
 class VariableInliner(ast.NodeTransformer):
     """Inline all local variable assignments into the return statement."""
 
+    # NodeTransformer itself has no __slots__, so instances keep a __dict__
+    # slot, but with every attribute in a slot it is never allocated
+    __slots__ = ('assignments', 'resolved', '_dispatch')
+
     def __init__(self):
         self.assignments = {}  # Maps variable names to their AST expressions
+        self.resolved: Dict[str, ast.AST] = {}  # Fully inlined expressions
+        # Only two node types are rewritten, so dispatch on type directly
+        self._dispatch = {
+            ast.FunctionDef: self.visit_FunctionDef,
+            ast.Name: self.visit_Name,
+        }
+
+    def visit(self, node):
+        """Visit a node via the type-keyed dispatch table."""
+        return self._dispatch.get(type(node), self.generic_visit)(node)
 
     def visit_FunctionDef(self, node):
         """Process function: collect assignments and inline into return."""
         self.assignments = {}
+        self.resolved = {}
 
-        # Collect all assignments
-        new_body = []
+        # Collect all assignments and the (last) return statement
         return_stmt = None
 
         for stmt in node.body:
@@ -38,54 +62,132 @@ class VariableInliner(ast.NodeTransformer):
                             pass
             elif isinstance(stmt, ast.Return):
                 return_stmt = stmt
-            elif not isinstance(stmt, (ast.Expr, ast.Pass)):
-                # Keep non-assignment statements (but this will make conversion fail)
-                new_body.append(stmt)
 
-        # Now inline variables into the return statement
+        # Now inline variables into the return statement. It is the only
+        # statement kept: the converter reads nothing but the return, and
+        # without one the program fails to convert either way
         if return_stmt and return_stmt.value:
-            inlined_expr = self.visit(return_stmt.value)
-            return_stmt.value = inlined_expr
-            new_body.append(return_stmt)
-
-        node.body = new_body
+            self._resolve_assignments(return_stmt.value)
+            return_stmt.value = self.visit(return_stmt.value)
+            node.body = [return_stmt]
+        else:
+            node.body = []
         return node
 
+    def _referenced_assignments(self, expr: ast.AST) -> Set[str]:
+        """Names of assigned variables that expr reads."""
+        return {
+            n.id for n in ast.walk(expr)
+            if isinstance(n, ast.Name) and isinstance(n.ctx, ast.Load) and n.id in self.assignments
+        }
+
+    def _resolve_assignments(self, root: ast.AST):
+        """
+        Fully inline every assignment that root depends on, once each.
+
+        Assignments are resolved in dependency order, so by the time a
+        right-hand side is visited all the variables it reads are already
+        fully inlined and visit_Name can substitute them without recursing.
+        Cyclic definitions raise graphlib.CycleError.
+        """
+        deps = {}
+        pending = list(self._referenced_assignments(root))
+        while pending:
+            name = pending.pop()
+            if name not in deps:
+                deps[name] = self._referenced_assignments(self.assignments[name])
+                pending.extend(deps[name])
+
+        for name in TopologicalSorter(deps).static_order():
+            self.resolved[name] = self.visit(self.assignments[name])
+
     def visit_Name(self, node):
-        """Replace variable references with their definitions."""
-        if isinstance(node.ctx, ast.Load) and node.id in self.assignments:
-            # Return a copy of the assigned expression
-            return ast.copy_location(
-                self.visit(self.assignments[node.id]),
-                node
-            )
+        """Replace variable references with their (already resolved) definitions."""
+        # Every reference shares the one resolved node rather than a copy:
+        # the tree only goes to ast.unparse, which neither mutates nodes nor
+        # needs source locations
+        if isinstance(node.ctx, ast.Load) and node.id in self.resolved:
+            return self.resolved[node.id]
         return node
 
 
-def inline_variables(code: str) -> Optional[str]:
-    """Inline all intermediate variables in Python code."""
+# Conservative test for a top-level assignment (any line starting with
+# "targets =", or any ';'); without one, inlining cannot change anything
+_ASSIGNMENT_RE = re.compile(r'^[ \t]*[\w.,()\[\] \t]+=(?!=)|;', re.M)
+
+# visit_FunctionDef resets its state, so one inliner serves every program
+_inliner = VariableInliner()
+
+
+@functools.lru_cache(maxsize=4096)
+def inline_variables_ast(code: str) -> Optional[ast.AST]:
+    """Inline all intermediate variables, returning the rewritten tree."""
+    # Cached per source string. The inliner rewrites the freshly parsed tree
+    # in place, but nothing downstream mutates the tree it returns
     try:
         tree = ast.parse(code)
-        inliner = VariableInliner()
-        new_tree = inliner.visit(tree)
-        ast.fix_missing_locations(new_tree)
-        return ast.unparse(new_tree)
-    except Exception as e:
+    except (SyntaxError, ValueError):  # ValueError: source with null bytes
         return None
 
+    try:
+        return _inliner.visit(tree)
+    except CycleError:  # a variable the return needs is defined in terms of itself
+        return None
 
-# Import the converter from the fixed version
-import sys
-sys.path.insert(0, '/home/ubuntu/cs2520/stitch_based_approach')
-from battleship_to_stitch_fixed import convert_program
+
+def inline_variables(code: str) -> Optional[str]:
+    """Inline all intermediate variables in Python code."""
+    new_tree = inline_variables_ast(code)
+    if new_tree is None:
+        return None
+    return ast.unparse(new_tree)
+
+
+def process(code: str) -> Tuple[bool, Optional[str], Set[str]]:
+    """
+    Inline variables in one program, then convert it to Stitch.
+
+    Returns:
+        (inlined, sexp_or_None, free_variables_found)
+    """
+    # Deferred so importing this module (and starting each pool worker)
+    # does not pay for the converter until it is actually used; it is found
+    # next to this script, which is run from its own directory
+    from battleship_to_stitch_fixed import convert_program, convert_program_ast
+
+    # Inline variables, then convert the rewritten tree directly rather than
+    # unparsing it only for the converter to parse it again. A cheap scan
+    # skips the inliner when there is nothing to inline
+    if _ASSIGNMENT_RE.search(code):
+        tree = inline_variables_ast(code)
+        if tree is None:
+            return False, None, set()
+        sexp, free_vars = convert_program_ast(tree)
+    else:
+        sexp, free_vars = convert_program(code)
+
+    if sexp and sexp != 'None':
+        return True, sexp, free_vars
+    return True, None, set()
+
+
+# Bump when inlining/conversion changes so stale cache entries are ignored
+CACHE_VERSION = 1
+
+
+def cache_key(code: str) -> str:
+    """Fingerprint of a solution's source for the on-disk result cache."""
+    digest = hashlib.blake2b(code.encode(), digest_size=16).hexdigest()
+    return f"{CACHE_VERSION}:{digest}"
 
 
 def main():
     """Process all programs: inline variables then convert to Stitch."""
     input_file = '../battleship_programs.jsonl'
     output_file = 'battleship_stitch_inlined.json'
+    cache_file = '.inline_cache'
 
-    programs = []
+    examples = []  # Only the first few programs are kept in memory
     successful = 0
     failed_inline = 0
     failed_convert = 0
@@ -93,32 +195,65 @@ def main():
     print("Inlining variables and converting to Stitch...")
     print()
 
-    with open(input_file, 'r') as f:
-        for i, line in enumerate(f, 1):
-            entry = json.loads(line)
-            code = entry['solution']
+    # Map the whole file and split it once instead of iterating line by line.
+    # mmap cannot map an empty file, which simply has no programs
+    with open(input_file, 'rb') as f:
+        if os.fstat(f.fileno()).st_size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                lines = mm[:].split(b'\n')
+        else:
+            lines = []
+    codes = [loads(line)['solution'] for line in lines if line]
+    keys = [cache_key(code) for code in codes]
 
-            # Step 1: Inline variables
-            inlined_code = inline_variables(code)
+    # Results from earlier runs are cached on disk by source fingerprint;
+    # only unseen solutions (deduplicated) are sent to the pool, which is
+    # not started at all when everything is cached.
+    # Programs are independent, so inline and convert them across cores;
+    # imap keeps results in input order. Each converted program is streamed
+    # into the output array as it arrives, laid out like json.dump(indent=2)
+    with shelve.open(cache_file) as cache, \
+            open(output_file, 'wb') as out, \
+            contextlib.ExitStack() as stack:
+        pending = {}
+        for key, code in zip(keys, codes):
+            if key not in cache:
+                pending.setdefault(key, code)
+        computed = iter(())
+        if pending:
+            pool = stack.enter_context(Pool(processes=os.cpu_count()))
+            computed = pool.imap(process, pending.values(), chunksize=64)
 
-            if not inlined_code:
+        # Per-program messages are collected and written out in one go
+        log = []
+
+        out.write(b'[')
+        for i, key in enumerate(keys, 1):
+            if key not in cache:
+                cache[key] = next(computed)
+            inlined, sexp, free_vars = cache[key]
+
+            if not inlined:
                 failed_inline += 1
                 continue
 
-            # Step 2: Convert to Stitch
-            sexp, free_vars = convert_program(inlined_code)
-
-            if sexp and sexp != 'None':
-                programs.append(sexp)
+            if sexp:
+                out.write(b',\n  ' if successful else b'\n  ')
+                out.write(dumps(sexp))
+                if len(examples) < 5:
+                    examples.append(sexp)
                 successful += 1
 
                 if free_vars and len(free_vars) > 0:
-                    print(f"Program {i} still has free vars after inlining: {free_vars}")
+                    log.append(f"Program {i} still has free vars after inlining: {free_vars}\n")
             else:
                 failed_convert += 1
 
             if i % 100 == 0:
-                print(f"Processed {i} programs...")
+                log.append(f"Processed {i} programs...\n")
+        out.write(b'\n]' if successful else b']')
+
+    sys.stdout.write(''.join(log))
 
     total = successful + failed_inline + failed_convert
     print()
@@ -127,16 +262,13 @@ def main():
     print(f"✗ Failed to convert: {failed_convert}/{total}")
     print()
 
-    # Save results
-    with open(output_file, 'w') as f:
-        json.dump(programs, f, indent=2)
-    print(f"✓ Saved {len(programs)} programs to {output_file}")
+    print(f"✓ Saved {successful} programs to {output_file}")
 
     # Show examples
-    if programs:
+    if examples:
         print()
         print("Example programs:")
-        for i, prog in enumerate(programs[:5], 1):
+        for i, prog in enumerate(examples, 1):
             print(f"{i}. {prog}")
 
 
@@ -0,0 +1,43 @@
+"""
+JSON reading and writing shared by the Stitch pipeline scripts.
+
+Uses orjson when it is installed and falls back to the stdlib json module,
+so every script reads and writes the same way either way.
+"""
+import json
+
+try:
+    import orjson
+except ImportError:  # fall back to the stdlib parser/encoder
+    orjson = None
+
+
+if orjson is not None:
+    loads = orjson.loads
+    dumps = orjson.dumps
+else:
+    loads = json.loads
+
+    def dumps(obj) -> bytes:
+        """Compact JSON encoding of obj, as bytes like orjson.dumps."""
+        return json.dumps(obj).encode()
+
+
+def load_json(path: str):
+    """Load a JSON file, using orjson when it is installed."""
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def dump_json(obj, path: str):
+    """Write obj to path as indented JSON, using orjson when it is installed."""
+    if orjson is not None:
+        # Non-string keys (e.g. int program ids) become strings, as with json
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        with open(path, 'w') as f:
+            json.dump(obj, f, indent=2)
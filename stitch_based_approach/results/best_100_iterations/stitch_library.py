@@ -1,904 +1,31 @@
 # Stitch-Discovered Helper Library
 # Auto-generated from compression results
-import numpy as np
+import functools
+import os
 
-def helper_1(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_0(#0) := (lam (lam (app tobool (app any #0))))
-    """
-    # TODO: Implement based on pattern
-    # fn_0(#0) := (lam (lam (app tobool (app any #0))))
-    pass
+# Patterns live in stitch_patterns.tsv (n<TAB>pattern) next to this file
+_PATTERNS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'stitch_patterns.tsv')
+NUM_HELPERS = 100
 
-def helper_2(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_1(#0,#1) := (app (app #1 #0))
-    """
-    # TODO: Implement based on pattern
-    # fn_1(#0,#1) := (app (app #1 #0))
-    pass
 
-def helper_3(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_2(#0) := (app all (fn_1 #0 eq (fn_1 #0 get 0)))
-    """
-    # TODO: Implement based on pattern
-    # fn_2(#0) := (app all (fn_1 #0 eq (fn_1 #0 get 0)))
-    pass
+@functools.lru_cache(maxsize=None)
+def _load_patterns():
+    with open(_PATTERNS_FILE) as f:
+        return {int(n): p for n, p in (line.rstrip('\n').split('\t', 1) for line in f)}
 
-def helper_4(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_3(#0,#1,#2) := (fn_1 #2 get (fn_1 #1 pair #0))
-    """
-    # TODO: Implement based on pattern
-    # fn_3(#0,#1,#2) := (fn_1 #2 get (fn_1 #1 pair #0))
-    pass
 
-def helper_5(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_4(#0,#1) := (fn_0 (fn_1 #1 and #0))
-    """
-    # TODO: Implement based on pattern
-    # fn_4(#0,#1) := (fn_0 (fn_1 #1 and #0))
-    pass
+def get_pattern(n):
+    """Return the Stitch pattern helper_n was discovered from."""
+    return _load_patterns()[n]
 
-def helper_6(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_5(#0,#1,#2) := (fn_1 (fn_3 #2 #1 0) #0 0)
-    """
-    # TODO: Implement based on pattern
-    # fn_5(#0,#1,#2) := (fn_1 (fn_3 #2 #1 0) #0 0)
-    pass
 
-def helper_7(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_6(#0) := (fn_1 #0 eq (app neg 1))
-    """
-    # TODO: Implement based on pattern
-    # fn_6(#0) := (fn_1 #0 eq (app neg 1))
-    pass
+def _make_helper(n):
+    def helper(*args):
+        pass
+    helper.__name__ = helper.__qualname__ = f"helper_{n}"
+    helper.__doc__ = f"Discovered by Stitch compression; see get_pattern({n})."
+    return helper
 
-def helper_8(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_7(#0) := (lam (lam (app tobool #0)))
-    """
-    # TODO: Implement based on pattern
-    # fn_7(#0) := (lam (lam (app tobool #0)))
-    pass
-
-def helper_9(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_8() := (app any)
-    """
-    # TODO: Implement based on pattern
-    # fn_8() := (app any)
-    pass
-
-def helper_10(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_9(#0) := (fn_1 #0 and)
-    """
-    # TODO: Implement based on pattern
-    # fn_9(#0) := (fn_1 #0 and)
-    pass
-
-def helper_11(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_10(#0) := (fn_1 #0 eq)
-    """
-    # TODO: Implement based on pattern
-    # fn_10(#0) := (fn_1 #0 eq)
-    pass
-
-def helper_12(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_11(#0) := (fn_1 #0 gt)
-    """
-    # TODO: Implement based on pattern
-    # fn_11(#0) := (fn_1 #0 gt)
-    pass
-
-def helper_13(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_12(#0) := (fn_5 #0 rowidx colidx)
-    """
-    # TODO: Implement based on pattern
-    # fn_12(#0) := (fn_5 #0 rowidx colidx)
-    pass
-
-def helper_14(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_13(#0) := (fn_10 (app unique #0) 1)
-    """
-    # TODO: Implement based on pattern
-    # fn_13(#0) := (fn_10 (app unique #0) 1)
-    pass
-
-def helper_15(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_14(#0,#1) := (fn_0 (fn_3 slice #1 #0))
-    """
-    # TODO: Implement based on pattern
-    # fn_14(#0,#1) := (fn_0 (fn_3 slice #1 #0))
-    pass
-
-def helper_16(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_15() := (fn_2 rows)
-    """
-    # TODO: Implement based on pattern
-    # fn_15() := (fn_2 rows)
-    pass
-
-def helper_17(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_16(#0,#1) := (fn_4 (fn_6 #1) (fn_11 #0 0))
-    """
-    # TODO: Implement based on pattern
-    # fn_16(#0,#1) := (fn_4 (fn_6 #1) (fn_11 #0 0))
-    pass
-
-def helper_18(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_17() := (fn_2 cols)
-    """
-    # TODO: Implement based on pattern
-    # fn_17() := (fn_2 cols)
-    pass
-
-def helper_19(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_18() := (fn_5 gt row col)
-    """
-    # TODO: Implement based on pattern
-    # fn_18() := (fn_5 gt row col)
-    pass
-
-def helper_20(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_19(#0,#1) := (lam (lam (app all (fn_10 (fn_3 #1 slice #0) (fn_3 #1 0 #0)))))
-    """
-    # TODO: Implement based on pattern
-    # fn_19(#0,#1) := (lam (lam (app all (fn_10 (fn_3 #1 slice #0) (fn_3 #1 0 #0)))))
-    pass
-
-def helper_21(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_20(#0,#1) := (lam (lam (fn_8 (fn_9 (fn_11 #1 0) (fn_6 #0)))))
-    """
-    # TODO: Implement based on pattern
-    # fn_20(#0,#1) := (lam (lam (fn_8 (fn_9 (fn_11 #1 0) (fn_6 #0)))))
-    pass
-
-def helper_22(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_21() := (fn_0 unrevealedships)
-    """
-    # TODO: Implement based on pattern
-    # fn_21() := (fn_0 unrevealedships)
-    pass
-
-def helper_23(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_22(#0) := (fn_1 #0 or)
-    """
-    # TODO: Implement based on pattern
-    # fn_22(#0) := (fn_1 #0 or)
-    pass
-
-def helper_24(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_23(#0,#1,#2) := (app all (fn_1 #2 #1 #0))
-    """
-    # TODO: Implement based on pattern
-    # fn_23(#0,#1,#2) := (app all (fn_1 #2 #1 #0))
-    pass
-
-def helper_25(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_24() := (fn_4 hiddentiles shiptiles)
-    """
-    # TODO: Implement based on pattern
-    # fn_24() := (fn_4 hiddentiles shiptiles)
-    pass
-
-def helper_26(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_25() := (fn_4 hiddenmask shipmask)
-    """
-    # TODO: Implement based on pattern
-    # fn_25() := (fn_4 hiddenmask shipmask)
-    pass
-
-def helper_27(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_26() := (fn_0 hiddenshiptiles)
-    """
-    # TODO: Implement based on pattern
-    # fn_26() := (fn_0 hiddenshiptiles)
-    pass
-
-def helper_28(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_27() := (fn_0 unrevealedshiptiles)
-    """
-    # TODO: Implement based on pattern
-    # fn_27() := (fn_0 unrevealedshiptiles)
-    pass
-
-def helper_29(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_28() := (fn_0 hiddenshipmask)
-    """
-    # TODO: Implement based on pattern
-    # fn_28() := (fn_0 hiddenshipmask)
-    pass
-
-def helper_30(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_29() := (fn_12 gt)
-    """
-    # TODO: Implement based on pattern
-    # fn_29() := (fn_12 gt)
-    pass
-
-def helper_31(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_30(#0) := (fn_3 #0 slice)
-    """
-    # TODO: Implement based on pattern
-    # fn_30(#0) := (fn_3 #0 slice)
-    pass
-
-def helper_32(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_31() := (fn_7 any)
-    """
-    # TODO: Implement based on pattern
-    # fn_31() := (fn_7 any)
-    pass
-
-def helper_33(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_32(#0) := (lam (lam (fn_9 (fn_10 (app len (#0 cols)) 1) (fn_11 (app len (#0 r...
-    """
-    # TODO: Implement based on pattern
-    # fn_32(#0) := (lam (lam (fn_9 (fn_10 (app len (#0 cols)) 1) (fn_11 (app len (#0 rows)) 1))))
-    pass
-
-def helper_34(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_33(#0,#1) := (fn_9 #1 (app not #0))
-    """
-    # TODO: Implement based on pattern
-    # fn_33(#0,#1) := (fn_9 #1 (app not #0))
-    pass
-
-def helper_35(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_34() := (fn_4 shipmask hiddenmask)
-    """
-    # TODO: Implement based on pattern
-    # fn_34() := (fn_4 shipmask hiddenmask)
-    pass
-
-def helper_36(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_35(#0,#1) := (fn_8 (fn_9 #1 #0))
-    """
-    # TODO: Implement based on pattern
-    # fn_35(#0,#1) := (fn_8 (fn_9 #1 #0))
-    pass
-
-def helper_37(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_36(#0,#1) := (fn_6 (fn_3 #1 #0 1))
-    """
-    # TODO: Implement based on pattern
-    # fn_36(#0,#1) := (fn_6 (fn_3 #1 #0 1))
-    pass
-
-def helper_38(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_37(#0) := (fn_14 #0 slice)
-    """
-    # TODO: Implement based on pattern
-    # fn_37(#0) := (fn_14 #0 slice)
-    pass
-
-def helper_39(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_38(#0) := (fn_1 #0 get)
-    """
-    # TODO: Implement based on pattern
-    # fn_38(#0) := (fn_1 #0 get)
-    pass
-
-def helper_40(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_39() := (fn_0 unrevealedship)
-    """
-    # TODO: Implement based on pattern
-    # fn_39() := (fn_0 unrevealedship)
-    pass
-
-def helper_41(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_40() := (fn_5 gt)
-    """
-    # TODO: Implement based on pattern
-    # fn_40() := (fn_5 gt)
-    pass
-
-def helper_42(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_41() := (fn_0 unrevealedshipmask)
-    """
-    # TODO: Implement based on pattern
-    # fn_41() := (fn_0 unrevealedshipmask)
-    pass
-
-def helper_43(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_42() := (fn_0 hiddenships)
-    """
-    # TODO: Implement based on pattern
-    # fn_42() := (fn_0 hiddenships)
-    pass
-
-def helper_44(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_43() := (fn_12 ne)
-    """
-    # TODO: Implement based on pattern
-    # fn_43() := (fn_12 ne)
-    pass
-
-def helper_45(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_44(#0,#1) := (fn_7 (fn_22 #1 #0))
-    """
-    # TODO: Implement based on pattern
-    # fn_44(#0,#1) := (fn_7 (fn_22 #1 #0))
-    pass
-
-def helper_46(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_45(#0) := (fn_10 #0 1)
-    """
-    # TODO: Implement based on pattern
-    # fn_45(#0) := (fn_10 #0 1)
-    pass
-
-def helper_47(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_46(#0) := (fn_11 #0 0)
-    """
-    # TODO: Implement based on pattern
-    # fn_46(#0) := (fn_11 #0 0)
-    pass
-
-def helper_48(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_47(#0) := (fn_11 #0 1)
-    """
-    # TODO: Implement based on pattern
-    # fn_47(#0) := (fn_11 #0 1)
-    pass
-
-def helper_49(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_48() := (lam (lam (fn_9 (fn_36 row col) (fn_5 ne row col))))
-    """
-    # TODO: Implement based on pattern
-    # fn_48() := (lam (lam (fn_9 (fn_36 row col) (fn_5 ne row col))))
-    pass
-
-def helper_50(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_49() := (app len)
-    """
-    # TODO: Implement based on pattern
-    # fn_49() := (app len)
-    pass
-
-def helper_51(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_50() := (fn_0 mask)
-    """
-    # TODO: Implement based on pattern
-    # fn_50() := (fn_0 mask)
-    pass
-
-def helper_52(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_51(#0) := (fn_4 #0 hidden)
-    """
-    # TODO: Implement based on pattern
-    # fn_51(#0) := (fn_4 #0 hidden)
-    pass
-
-def helper_53(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_52(#0,#1) := (lam (lam (fn_8 (fn_3 slice #1 #0))))
-    """
-    # TODO: Implement based on pattern
-    # fn_52(#0,#1) := (lam (lam (fn_8 (fn_3 slice #1 #0))))
-    pass
-
-def helper_54(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_53() := (app all)
-    """
-    # TODO: Implement based on pattern
-    # fn_53() := (app all)
-    pass
-
-def helper_55(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_54() := (fn_4 maskhidden maskship)
-    """
-    # TODO: Implement based on pattern
-    # fn_54() := (fn_4 maskhidden maskship)
-    pass
-
-def helper_56(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_55() := (fn_20 (fn_38 1 rowidx) (fn_38 0 rowidx))
-    """
-    # TODO: Implement based on pattern
-    # fn_55() := (fn_20 (fn_38 1 rowidx) (fn_38 0 rowidx))
-    pass
-
-def helper_57(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_56() := (fn_16 tr pr)
-    """
-    # TODO: Implement based on pattern
-    # fn_56() := (fn_16 tr pr)
-    pass
-
-def helper_58(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_57(#0) := (fn_23 #0 lt)
-    """
-    # TODO: Implement based on pattern
-    # fn_57(#0) := (fn_23 #0 lt)
-    pass
-
-def helper_59(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_58(#0) := (fn_1 #0 gte)
-    """
-    # TODO: Implement based on pattern
-    # fn_58(#0) := (fn_1 #0 gte)
-    pass
-
-def helper_60(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_59(#0) := (fn_4 hiddenmask (fn_9 #0 shipmask))
-    """
-    # TODO: Implement based on pattern
-    # fn_59(#0) := (fn_4 hiddenmask (fn_9 #0 shipmask))
-    pass
-
-def helper_61(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_60(#0) := (fn_40 #0 #0)
-    """
-    # TODO: Implement based on pattern
-    # fn_60(#0) := (fn_40 #0 #0)
-    pass
-
-def helper_62(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_61(#0,#1) := (fn_10 (fn_3 #1 #0 0))
-    """
-    # TODO: Implement based on pattern
-    # fn_61(#0,#1) := (fn_10 (fn_3 #1 #0 0))
-    pass
-
-def helper_63(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_62(#0,#1,#2) := (fn_22 (#1 #2) (#1 #0))
-    """
-    # TODO: Implement based on pattern
-    # fn_62(#0,#1,#2) := (fn_22 (#1 #2) (#1 #0))
-    pass
-
-def helper_64(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_63() := (lam (lam (fn_13 cols)))
-    """
-    # TODO: Implement based on pattern
-    # fn_63() := (lam (lam (fn_13 cols)))
-    pass
-
-def helper_65(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_64(#0,#1) := (lam (lam (fn_5 ne #1 #0)))
-    """
-    # TODO: Implement based on pattern
-    # fn_64(#0,#1) := (lam (lam (fn_5 ne #1 #0)))
-    pass
-
-def helper_66(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_65() := (fn_0 hiddenshipcells)
-    """
-    # TODO: Implement based on pattern
-    # fn_65() := (fn_0 hiddenshipcells)
-    pass
-
-def helper_67(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_66() := (fn_7 fn_17)
-    """
-    # TODO: Implement based on pattern
-    # fn_66() := (fn_7 fn_17)
-    pass
-
-def helper_68(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_67(#0,#1) := (fn_1 #1 #0 1)
-    """
-    # TODO: Implement based on pattern
-    # fn_67(#0,#1) := (fn_1 #1 #0 1)
-    pass
-
-def helper_69(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_68() := (lam (lam (fn_13 rows)))
-    """
-    # TODO: Implement based on pattern
-    # fn_68() := (lam (lam (fn_13 rows)))
-    pass
-
-def helper_70(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_69(#0) := (lam (lam (fn_10 (fn_1 #0 mod 2) 0)))
-    """
-    # TODO: Implement based on pattern
-    # fn_69(#0) := (lam (lam (fn_10 (fn_1 #0 mod 2) 0)))
-    pass
-
-def helper_71(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_70() := (fn_30 0)
-    """
-    # TODO: Implement based on pattern
-    # fn_70() := (fn_30 0)
-    pass
-
-def helper_72(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_71() := (fn_30 1)
-    """
-    # TODO: Implement based on pattern
-    # fn_71() := (fn_30 1)
-    pass
-
-def helper_73(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_72() := (fn_4 hiddencells shipcells)
-    """
-    # TODO: Implement based on pattern
-    # fn_72() := (fn_4 hiddencells shipcells)
-    pass
-
-def helper_74(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_73() := (fn_7 isvertical)
-    """
-    # TODO: Implement based on pattern
-    # fn_73() := (fn_7 isvertical)
-    pass
-
-def helper_75(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_74() := (fn_22 (fn_22 ontopedge onbottomedge) onleftedge)
-    """
-    # TODO: Implement based on pattern
-    # fn_74() := (fn_22 (fn_22 ontopedge onbottomedge) onleftedge)
-    pass
-
-def helper_76(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_75() := (fn_7 unrevealedshiptiles.any)
-    """
-    # TODO: Implement based on pattern
-    # fn_75() := (fn_7 unrevealedshiptiles.any)
-    pass
-
-def helper_77(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_76() := (fn_4 shiptiles hiddentiles)
-    """
-    # TODO: Implement based on pattern
-    # fn_76() := (fn_4 shiptiles hiddentiles)
-    pass
-
-def helper_78(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_77(#0,#1) := (fn_7 (fn_9 #1 #0))
-    """
-    # TODO: Implement based on pattern
-    # fn_77(#0,#1) := (fn_7 (fn_9 #1 #0))
-    pass
-
-def helper_79(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_78(#0) := (#0 ishidden isship)
-    """
-    # TODO: Implement based on pattern
-    # fn_78(#0) := (#0 ishidden isship)
-    pass
-
-def helper_80(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_79() := (lam (lam false))
-    """
-    # TODO: Implement based on pattern
-    # fn_79() := (lam (lam false))
-    pass
-
-def helper_81(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_80() := (lam (lam (fn_8 hiddenshiptiles)))
-    """
-    # TODO: Implement based on pattern
-    # fn_80() := (lam (lam (fn_8 hiddenshiptiles)))
-    pass
-
-def helper_82(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_81(#0,#1) := (lam (lam (fn_8 (fn_10 #1 #0))))
-    """
-    # TODO: Implement based on pattern
-    # fn_81(#0,#1) := (lam (lam (fn_8 (fn_10 #1 #0))))
-    pass
-
-def helper_83(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_82() := (lam (lam (fn_8 (fn_30 slice unrevealedships))))
-    """
-    # TODO: Implement based on pattern
-    # fn_82() := (lam (lam (fn_8 (fn_30 slice unrevealedships))))
-    pass
-
-def helper_84(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_83(#0) := (lam (lam (fn_35 shipmask (fn_9 #0 hiddenmask))))
-    """
-    # TODO: Implement based on pattern
-    # fn_83(#0) := (lam (lam (fn_35 shipmask (fn_9 #0 hiddenmask))))
-    pass
-
-def helper_85(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_84(#0) := (lam (lam (fn_8 (fn_1 #0 np.isin unit))))
-    """
-    # TODO: Implement based on pattern
-    # fn_84(#0) := (lam (lam (fn_8 (fn_1 #0 np.isin unit))))
-    pass
-
-def helper_86(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_85() := (fn_7 fn_15)
-    """
-    # TODO: Implement based on pattern
-    # fn_85() := (fn_7 fn_15)
-    pass
-
-def helper_87(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_86() := (fn_51 ship)
-    """
-    # TODO: Implement based on pattern
-    # fn_86() := (fn_51 ship)
-    pass
-
-def helper_88(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_87() := (fn_0 unrevealedshipintop)
-    """
-    # TODO: Implement based on pattern
-    # fn_87() := (fn_0 unrevealedshipintop)
-    pass
-
-def helper_89(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_88(#0) := (fn_44 (fn_8 #0))
-    """
-    # TODO: Implement based on pattern
-    # fn_88(#0) := (fn_44 (fn_8 #0))
-    pass
-
-def helper_90(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_89(#0) := (fn_4 #0 unrevealed)
-    """
-    # TODO: Implement based on pattern
-    # fn_89(#0) := (fn_4 #0 unrevealed)
-    pass
-
-def helper_91(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_90(#0) := (fn_1 #0 lt)
-    """
-    # TODO: Implement based on pattern
-    # fn_90(#0) := (fn_1 #0 lt)
-    pass
-
-def helper_92(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_91(#0,#1) := (fn_0 (fn_30 #1 #0))
-    """
-    # TODO: Implement based on pattern
-    # fn_91(#0,#1) := (fn_0 (fn_30 #1 #0))
-    pass
-
-def helper_93(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_92(#0,#1,#2) := (fn_22 (fn_62 #2 fn_8 #1) (fn_8 #0))
-    """
-    # TODO: Implement based on pattern
-    # fn_92(#0,#1,#2) := (fn_22 (fn_62 #2 fn_8 #1) (fn_8 #0))
-    pass
-
-def helper_94(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_93() := (lam (lam (fn_2 shiprows)))
-    """
-    # TODO: Implement based on pattern
-    # fn_93() := (lam (lam (fn_2 shiprows)))
-    pass
-
-def helper_95(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_94() := (lam (lam (fn_8 hiddenships)))
-    """
-    # TODO: Implement based on pattern
-    # fn_94() := (lam (lam (fn_8 hiddenships)))
-    pass
-
-def helper_96(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_95(#0) := (lam (lam (fn_11 #0 2)))
-    """
-    # TODO: Implement based on pattern
-    # fn_95(#0) := (lam (lam (fn_11 #0 2)))
-    pass
-
-def helper_97(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_96(#0) := (lam (lam (app not #0)))
-    """
-    # TODO: Implement based on pattern
-    # fn_96(#0) := (lam (lam (app not #0)))
-    pass
-
-def helper_98(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_97(#0) := (lam (lam (fn_57 4 #0)))
-    """
-    # TODO: Implement based on pattern
-    # fn_97(#0) := (lam (lam (fn_57 4 #0)))
-    pass
-
-def helper_99(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_98(#0,#1) := (lam (lam (fn_53 (fn_10 #1 #0))))
-    """
-    # TODO: Implement based on pattern
-    # fn_98(#0,#1) := (lam (lam (fn_53 (fn_10 #1 #0))))
-    pass
-
-def helper_100(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_99(#0,#1,#2) := (lam (lam (fn_9 #2 (fn_10 #1 #0))))
-    """
-    # TODO: Implement based on pattern
-    # fn_99(#0,#1,#2) := (lam (lam (fn_9 #2 (fn_10 #1 #0))))
-    pass
 
+# TODO: Implement helpers based on their patterns
+globals().update({f"helper_{n}": _make_helper(n) for n in range(1, NUM_HELPERS + 1)})
@@ -1,184 +1,173 @@
 # Stitch-Discovered Helper Library
-# Auto-generated from compression results
+# Auto-generated from compression results; helpers translated to NumPy by hand
+import functools
+import os
+
 import numpy as np
 
-def helper_1(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_0(#0) := (lam (lam (app tobool (app any #0))))
-    """
-    # TODO: Implement based on pattern
-    # fn_0(#0) := (lam (lam (app tobool (app any #0))))
-    pass
-
-def helper_2(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_1(#0,#1) := (app (app #1 #0))
-    """
-    # TODO: Implement based on pattern
-    # fn_1(#0,#1) := (app (app #1 #0))
-    pass
-
-def helper_3(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_2(#0) := (app all (fn_1 #0 eq (fn_1 #0 get 0)))
-    """
-    # TODO: Implement based on pattern
-    # fn_2(#0) := (app all (fn_1 #0 eq (fn_1 #0 get 0)))
-    pass
-
-def helper_4(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_3(#0,#1,#2) := (fn_1 #2 get (fn_1 #1 pair #0))
-    """
-    # TODO: Implement based on pattern
-    # fn_3(#0,#1,#2) := (fn_1 #2 get (fn_1 #1 pair #0))
-    pass
-
-def helper_5(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_4(#0,#1) := (fn_0 (fn_1 #1 and #0))
-    """
-    # TODO: Implement based on pattern
-    # fn_4(#0,#1) := (fn_0 (fn_1 #1 and #0))
-    pass
-
-def helper_6(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_5(#0,#1,#2) := (fn_1 (fn_3 #2 #1 0) #0 0)
-    """
-    # TODO: Implement based on pattern
-    # fn_5(#0,#1,#2) := (fn_1 (fn_3 #2 #1 0) #0 0)
-    pass
-
-def helper_7(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_6(#0) := (fn_1 #0 eq (app neg 1))
-    """
-    # TODO: Implement based on pattern
-    # fn_6(#0) := (fn_1 #0 eq (app neg 1))
-    pass
-
-def helper_8(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_7(#0) := (lam (lam (app tobool #0)))
-    """
-    # TODO: Implement based on pattern
-    # fn_7(#0) := (lam (lam (app tobool #0)))
-    pass
-
-def helper_9(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_8() := (app any)
-    """
-    # TODO: Implement based on pattern
-    # fn_8() := (app any)
-    pass
-
-def helper_10(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_9(#0) := (fn_1 #0 and)
-    """
-    # TODO: Implement based on pattern
-    # fn_9(#0) := (fn_1 #0 and)
-    pass
-
-def helper_11(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_10(#0) := (fn_1 #0 eq)
-    """
-    # TODO: Implement based on pattern
-    # fn_10(#0) := (fn_1 #0 eq)
-    pass
-
-def helper_12(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_11(#0) := (fn_1 #0 gt)
-    """
-    # TODO: Implement based on pattern
-    # fn_11(#0) := (fn_1 #0 gt)
-    pass
-
-def helper_13(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_12(#0) := (fn_5 #0 rowidx colidx)
-    """
-    # TODO: Implement based on pattern
-    # fn_12(#0) := (fn_5 #0 rowidx colidx)
-    pass
-
-def helper_14(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_13(#0) := (fn_10 (app unique #0) 1)
-    """
-    # TODO: Implement based on pattern
-    # fn_13(#0) := (fn_10 (app unique #0) 1)
-    pass
-
-def helper_15(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_14(#0,#1) := (fn_0 (fn_3 slice #1 #0))
-    """
-    # TODO: Implement based on pattern
-    # fn_14(#0,#1) := (fn_0 (fn_3 slice #1 #0))
-    pass
-
-def helper_16(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_15() := (fn_2 rows)
-    """
-    # TODO: Implement based on pattern
-    # fn_15() := (fn_2 rows)
-    pass
-
-def helper_17(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_16(#0,#1) := (fn_4 (fn_6 #1) (fn_11 #0 0))
-    """
-    # TODO: Implement based on pattern
-    # fn_16(#0,#1) := (fn_4 (fn_6 #1) (fn_11 #0 0))
-    pass
-
-def helper_18(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_17() := (fn_2 cols)
-    """
-    # TODO: Implement based on pattern
-    # fn_17() := (fn_2 cols)
-    pass
-
-def helper_19(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_18() := (fn_5 gt row col)
-    """
-    # TODO: Implement based on pattern
-    # fn_18() := (fn_5 gt row col)
-    pass
-
-def helper_20(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_19(#0,#1) := (lam (lam (app all (fn_10 (fn_3 #1 slice #0) (fn_3 #1 0 #0)))))
-    """
-    # TODO: Implement based on pattern
-    # fn_19(#0,#1) := (lam (lam (app all (fn_10 (fn_3 #1 slice #0) (fn_3 #1 0 #0)))))
-    pass
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the NumPy versions are used instead
+    njit = None
+
+# Patterns live in stitch_patterns.tsv (n<TAB>pattern) next to this file
+_PATTERNS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'stitch_patterns.tsv')
+NUM_HELPERS = 20
+
+
+@functools.lru_cache(maxsize=None)
+def _load_patterns():
+    with open(_PATTERNS_FILE) as f:
+        return {int(n): p for n, p in (line.rstrip('\n').split('\t', 1) for line in f)}
+
+
+def get_pattern(n):
+    """Return the Stitch pattern helper_n was discovered from."""
+    return _load_patterns()[n]
+
+
+# Each helper evaluates its pattern as one vectorized NumPy expression.
+# A bare 0 in index position in a pattern is the board the program is
+# called with, which becomes the board argument here.
+# Indexing helpers accept scalar or array row/col indices, so a whole set
+# of cells is looked up and compared in one broadcast call.
+
+
+def helper_1(x):
+    """fn_0: any(x)"""
+    return bool(np.any(x))
+
+
+def helper_2(x, op):
+    """fn_1: op applied with x as its first operand"""
+    return functools.partial(op, x)
+
+
+def helper_3(x):
+    """fn_2: all(x == x[0])"""
+    return bool(np.all(x == x[0]))
+
+
+def helper_4(col, row, board):
+    """fn_3: board[row, col]"""
+    return board[row, col]
+
+
+def helper_5(a, b):
+    """fn_4: any(b & a)"""
+    return bool(np.any(np.logical_and(b, a)))
+
+
+def helper_6(op, row, col, board):
+    """fn_5: op(board[row, col], 0)"""
+    return op(board[row, col], 0)
+
+
+def helper_7(x):
+    """fn_6: x == -1"""
+    return np.equal(x, -1)
+
+
+def helper_8(x):
+    """fn_7: bool(x)"""
+    return bool(x)
+
+
+def helper_9(x):
+    """fn_8: any(x)"""
+    return bool(np.any(x))
+
+
+def helper_10(a, b):
+    """fn_9: a & b"""
+    return np.logical_and(a, b)
+
+
+def helper_11(a, b):
+    """fn_10: a == b"""
+    return np.equal(a, b)
+
+
+def helper_12(a, b):
+    """fn_11: a > b"""
+    return np.greater(a, b)
+
+
+def helper_13(op, board, rowidx, colidx):
+    """fn_12: op(board[rowidx, colidx], 0)"""
+    return op(np.ascontiguousarray(board)[rowidx, colidx], 0)
+
+
+def helper_14(x):
+    """fn_13: len(unique(x)) == 1"""
+    return np.unique(x).size == 1
+
+
+def helper_15(board, row):
+    """fn_14: any(board[row, :])"""
+    return bool(np.any(board[row, :]))
+
+
+def helper_16(rows):
+    """fn_15: all(rows == rows[0])"""
+    return bool(np.all(rows == rows[0]))
+
+
+def helper_17(ships, board):
+    """fn_16: any((ships > 0) & (board == -1))"""
+    return bool(np.any((ships > 0) & (board == -1)))
+
+
+def helper_18(cols):
+    """fn_17: all(cols == cols[0])"""
+    return bool(np.all(cols == cols[0]))
+
+
+def helper_19(board, row, col):
+    """fn_18: board[row, col] > 0"""
+    return np.greater(np.ascontiguousarray(board)[row, col], 0)
+
+
+def helper_20(board, col):
+    """fn_19: all(board[:, col] == board[0, col])"""
+    return bool(np.all(board[:, col] == board[0, col]))
+
+
+# Boards are tiny, so NumPy's per-call overhead dominates the hot
+# predicates. With numba they become early-exit scalar loops, compiled
+# lazily for whatever dtype and layout they are called with, so they
+# accept the same arrays as the NumPy versions they replace.
+if njit is not None:
+    @njit(cache=True)
+    def helper_16(rows):
+        """fn_15: all(rows == rows[0])"""
+        for i in range(1, rows.size):
+            if rows[i] != rows[0]:
+                return False
+        return True
+
+    @njit(cache=True)
+    def helper_17(ships, board):
+        """fn_16: any((ships > 0) & (board == -1))"""
+        # Flattened, so whole boards and single rows or columns both work
+        ship_cells, board_cells = ships.ravel(), board.ravel()
+        for i in range(ship_cells.size):
+            if ship_cells[i] > 0 and board_cells[i] == -1:
+                return True
+        return False
+
+    @njit(cache=True)
+    def helper_18(cols):
+        """fn_17: all(cols == cols[0])"""
+        for i in range(1, cols.size):
+            if cols[i] != cols[0]:
+                return False
+        return True
 
+    @njit(cache=True)
+    def helper_20(board, col):
+        """fn_19: all(board[:, col] == board[0, col])"""
+        for i in range(1, board.shape[0]):
+            if board[i, col] != board[0, col]:
+                return False
+        return True
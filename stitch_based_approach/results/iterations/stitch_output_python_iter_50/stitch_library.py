@@ -1,454 +1,334 @@
 # Stitch-Discovered Helper Library
-# Auto-generated from compression results
+# Auto-generated from compression results; helpers translated to NumPy by hand
+import functools
+import os
+
 import numpy as np
 
-def helper_1(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_0(#0) := (lam (lam (app tobool (app any #0))))
-    """
-    # TODO: Implement based on pattern
-    # fn_0(#0) := (lam (lam (app tobool (app any #0))))
-    pass
-
-def helper_2(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_1(#0,#1) := (app (app #1 #0))
-    """
-    # TODO: Implement based on pattern
-    # fn_1(#0,#1) := (app (app #1 #0))
-    pass
-
-def helper_3(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_2(#0) := (app all (fn_1 #0 eq (fn_1 #0 get 0)))
-    """
-    # TODO: Implement based on pattern
-    # fn_2(#0) := (app all (fn_1 #0 eq (fn_1 #0 get 0)))
-    pass
-
-def helper_4(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_3(#0,#1,#2) := (fn_1 #2 get (fn_1 #1 pair #0))
-    """
-    # TODO: Implement based on pattern
-    # fn_3(#0,#1,#2) := (fn_1 #2 get (fn_1 #1 pair #0))
-    pass
-
-def helper_5(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_4(#0,#1) := (fn_0 (fn_1 #1 and #0))
-    """
-    # TODO: Implement based on pattern
-    # fn_4(#0,#1) := (fn_0 (fn_1 #1 and #0))
-    pass
-
-def helper_6(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_5(#0,#1,#2) := (fn_1 (fn_3 #2 #1 0) #0 0)
-    """
-    # TODO: Implement based on pattern
-    # fn_5(#0,#1,#2) := (fn_1 (fn_3 #2 #1 0) #0 0)
-    pass
-
-def helper_7(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_6(#0) := (fn_1 #0 eq (app neg 1))
-    """
-    # TODO: Implement based on pattern
-    # fn_6(#0) := (fn_1 #0 eq (app neg 1))
-    pass
-
-def helper_8(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_7(#0) := (lam (lam (app tobool #0)))
-    """
-    # TODO: Implement based on pattern
-    # fn_7(#0) := (lam (lam (app tobool #0)))
-    pass
-
-def helper_9(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_8() := (app any)
-    """
-    # TODO: Implement based on pattern
-    # fn_8() := (app any)
-    pass
-
-def helper_10(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_9(#0) := (fn_1 #0 and)
-    """
-    # TODO: Implement based on pattern
-    # fn_9(#0) := (fn_1 #0 and)
-    pass
-
-def helper_11(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_10(#0) := (fn_1 #0 eq)
-    """
-    # TODO: Implement based on pattern
-    # fn_10(#0) := (fn_1 #0 eq)
-    pass
-
-def helper_12(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_11(#0) := (fn_1 #0 gt)
-    """
-    # TODO: Implement based on pattern
-    # fn_11(#0) := (fn_1 #0 gt)
-    pass
-
-def helper_13(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_12(#0) := (fn_5 #0 rowidx colidx)
-    """
-    # TODO: Implement based on pattern
-    # fn_12(#0) := (fn_5 #0 rowidx colidx)
-    pass
-
-def helper_14(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_13(#0) := (fn_10 (app unique #0) 1)
-    """
-    # TODO: Implement based on pattern
-    # fn_13(#0) := (fn_10 (app unique #0) 1)
-    pass
-
-def helper_15(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_14(#0,#1) := (fn_0 (fn_3 slice #1 #0))
-    """
-    # TODO: Implement based on pattern
-    # fn_14(#0,#1) := (fn_0 (fn_3 slice #1 #0))
-    pass
-
-def helper_16(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_15() := (fn_2 rows)
-    """
-    # TODO: Implement based on pattern
-    # fn_15() := (fn_2 rows)
-    pass
-
-def helper_17(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_16(#0,#1) := (fn_4 (fn_6 #1) (fn_11 #0 0))
-    """
-    # TODO: Implement based on pattern
-    # fn_16(#0,#1) := (fn_4 (fn_6 #1) (fn_11 #0 0))
-    pass
-
-def helper_18(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_17() := (fn_2 cols)
-    """
-    # TODO: Implement based on pattern
-    # fn_17() := (fn_2 cols)
-    pass
-
-def helper_19(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_18() := (fn_5 gt row col)
-    """
-    # TODO: Implement based on pattern
-    # fn_18() := (fn_5 gt row col)
-    pass
-
-def helper_20(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_19(#0,#1) := (lam (lam (app all (fn_10 (fn_3 #1 slice #0) (fn_3 #1 0 #0)))))
-    """
-    # TODO: Implement based on pattern
-    # fn_19(#0,#1) := (lam (lam (app all (fn_10 (fn_3 #1 slice #0) (fn_3 #1 0 #0)))))
-    pass
-
-def helper_21(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_20(#0,#1) := (lam (lam (fn_8 (fn_9 (fn_11 #1 0) (fn_6 #0)))))
-    """
-    # TODO: Implement based on pattern
-    # fn_20(#0,#1) := (lam (lam (fn_8 (fn_9 (fn_11 #1 0) (fn_6 #0)))))
-    pass
-
-def helper_22(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_21() := (fn_0 unrevealedships)
-    """
-    # TODO: Implement based on pattern
-    # fn_21() := (fn_0 unrevealedships)
-    pass
-
-def helper_23(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_22(#0) := (fn_1 #0 or)
-    """
-    # TODO: Implement based on pattern
-    # fn_22(#0) := (fn_1 #0 or)
-    pass
-
-def helper_24(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_23(#0,#1,#2) := (app all (fn_1 #2 #1 #0))
-    """
-    # TODO: Implement based on pattern
-    # fn_23(#0,#1,#2) := (app all (fn_1 #2 #1 #0))
-    pass
-
-def helper_25(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_24() := (fn_4 hiddentiles shiptiles)
-    """
-    # TODO: Implement based on pattern
-    # fn_24() := (fn_4 hiddentiles shiptiles)
-    pass
-
-def helper_26(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_25() := (fn_4 hiddenmask shipmask)
-    """
-    # TODO: Implement based on pattern
-    # fn_25() := (fn_4 hiddenmask shipmask)
-    pass
-
-def helper_27(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_26() := (fn_0 hiddenshiptiles)
-    """
-    # TODO: Implement based on pattern
-    # fn_26() := (fn_0 hiddenshiptiles)
-    pass
-
-def helper_28(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_27() := (fn_0 unrevealedshiptiles)
-    """
-    # TODO: Implement based on pattern
-    # fn_27() := (fn_0 unrevealedshiptiles)
-    pass
-
-def helper_29(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_28() := (fn_0 hiddenshipmask)
-    """
-    # TODO: Implement based on pattern
-    # fn_28() := (fn_0 hiddenshipmask)
-    pass
-
-def helper_30(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_29() := (fn_12 gt)
-    """
-    # TODO: Implement based on pattern
-    # fn_29() := (fn_12 gt)
-    pass
-
-def helper_31(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_30(#0) := (fn_3 #0 slice)
-    """
-    # TODO: Implement based on pattern
-    # fn_30(#0) := (fn_3 #0 slice)
-    pass
-
-def helper_32(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_31() := (fn_7 any)
-    """
-    # TODO: Implement based on pattern
-    # fn_31() := (fn_7 any)
-    pass
-
-def helper_33(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_32(#0) := (lam (lam (fn_9 (fn_10 (app len (#0 cols)) 1) (fn_11 (app len (#0 r...
-    """
-    # TODO: Implement based on pattern
-    # fn_32(#0) := (lam (lam (fn_9 (fn_10 (app len (#0 cols)) 1) (fn_11 (app len (#0 rows)) 1))))
-    pass
-
-def helper_34(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_33(#0,#1) := (fn_9 #1 (app not #0))
-    """
-    # TODO: Implement based on pattern
-    # fn_33(#0,#1) := (fn_9 #1 (app not #0))
-    pass
-
-def helper_35(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_34() := (fn_4 shipmask hiddenmask)
-    """
-    # TODO: Implement based on pattern
-    # fn_34() := (fn_4 shipmask hiddenmask)
-    pass
-
-def helper_36(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_35(#0,#1) := (fn_8 (fn_9 #1 #0))
-    """
-    # TODO: Implement based on pattern
-    # fn_35(#0,#1) := (fn_8 (fn_9 #1 #0))
-    pass
-
-def helper_37(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_36(#0,#1) := (fn_6 (fn_3 #1 #0 1))
-    """
-    # TODO: Implement based on pattern
-    # fn_36(#0,#1) := (fn_6 (fn_3 #1 #0 1))
-    pass
-
-def helper_38(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_37(#0) := (fn_14 #0 slice)
-    """
-    # TODO: Implement based on pattern
-    # fn_37(#0) := (fn_14 #0 slice)
-    pass
-
-def helper_39(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_38(#0) := (fn_1 #0 get)
-    """
-    # TODO: Implement based on pattern
-    # fn_38(#0) := (fn_1 #0 get)
-    pass
-
-def helper_40(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_39() := (fn_0 unrevealedship)
-    """
-    # TODO: Implement based on pattern
-    # fn_39() := (fn_0 unrevealedship)
-    pass
-
-def helper_41(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_40() := (fn_5 gt)
-    """
-    # TODO: Implement based on pattern
-    # fn_40() := (fn_5 gt)
-    pass
-
-def helper_42(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_41() := (fn_0 unrevealedshipmask)
-    """
-    # TODO: Implement based on pattern
-    # fn_41() := (fn_0 unrevealedshipmask)
-    pass
-
-def helper_43(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_42() := (fn_0 hiddenships)
-    """
-    # TODO: Implement based on pattern
-    # fn_42() := (fn_0 hiddenships)
-    pass
-
-def helper_44(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_43() := (fn_12 ne)
-    """
-    # TODO: Implement based on pattern
-    # fn_43() := (fn_12 ne)
-    pass
-
-def helper_45(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_44(#0,#1) := (fn_7 (fn_22 #1 #0))
-    """
-    # TODO: Implement based on pattern
-    # fn_44(#0,#1) := (fn_7 (fn_22 #1 #0))
-    pass
-
-def helper_46(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_45(#0) := (fn_10 #0 1)
-    """
-    # TODO: Implement based on pattern
-    # fn_45(#0) := (fn_10 #0 1)
-    pass
-
-def helper_47(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_46(#0) := (fn_11 #0 0)
-    """
-    # TODO: Implement based on pattern
-    # fn_46(#0) := (fn_11 #0 0)
-    pass
-
-def helper_48(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_47(#0) := (fn_11 #0 1)
-    """
-    # TODO: Implement based on pattern
-    # fn_47(#0) := (fn_11 #0 1)
-    pass
-
-def helper_49(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_48() := (lam (lam (fn_9 (fn_36 row col) (fn_5 ne row col))))
-    """
-    # TODO: Implement based on pattern
-    # fn_48() := (lam (lam (fn_9 (fn_36 row col) (fn_5 ne row col))))
-    pass
-
-def helper_50(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_49() := (app len)
-    """
-    # TODO: Implement based on pattern
-    # fn_49() := (app len)
-    pass
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the NumPy versions are used instead
+    njit = None
+
+# Patterns live in stitch_patterns.tsv (n<TAB>pattern) next to this file
+_PATTERNS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'stitch_patterns.tsv')
+NUM_HELPERS = 50
+
+
+@functools.lru_cache(maxsize=None)
+def _load_patterns():
+    with open(_PATTERNS_FILE) as f:
+        return {int(n): p for n, p in (line.rstrip('\n').split('\t', 1) for line in f)}
+
+
+def get_pattern(n):
+    """Return the Stitch pattern helper_n was discovered from."""
+    return _load_patterns()[n]
+
+
+# Each helper evaluates its pattern as one vectorized NumPy expression.
+# A bare 0 in index position in a pattern is the board the program is
+# called with, which becomes the board argument here.
+# Indexing helpers accept scalar or array row/col indices, so a whole set
+# of cells is looked up and compared in one broadcast call.
+
+
+def helper_1(x):
+    """fn_0: any(x)"""
+    return bool(np.any(x))
+
+
+def helper_2(x, op):
+    """fn_1: op applied with x as its first operand"""
+    return functools.partial(op, x)
+
+
+def helper_3(x):
+    """fn_2: all(x == x[0])"""
+    return bool(np.all(x == x[0]))
+
+
+def helper_4(col, row, board):
+    """fn_3: board[row, col]"""
+    return board[row, col]
+
+
+def helper_5(a, b):
+    """fn_4: any(b & a)"""
+    return bool(np.any(np.logical_and(b, a)))
+
+
+def helper_6(op, row, col, board):
+    """fn_5: op(board[row, col], 0)"""
+    return op(board[row, col], 0)
+
+
+def helper_7(x):
+    """fn_6: x == -1"""
+    return np.equal(x, -1)
+
+
+def helper_8(x):
+    """fn_7: bool(x)"""
+    return bool(x)
+
+
+def helper_9(x):
+    """fn_8: any(x)"""
+    return bool(np.any(x))
+
+
+def helper_10(a, b):
+    """fn_9: a & b"""
+    return np.logical_and(a, b)
+
+
+def helper_11(a, b):
+    """fn_10: a == b"""
+    return np.equal(a, b)
+
+
+def helper_12(a, b):
+    """fn_11: a > b"""
+    return np.greater(a, b)
+
+
+def helper_13(op, board, rowidx, colidx):
+    """fn_12: op(board[rowidx, colidx], 0)"""
+    return op(np.ascontiguousarray(board)[rowidx, colidx], 0)
+
+
+def helper_14(x):
+    """fn_13: len(unique(x)) == 1"""
+    return np.unique(x).size == 1
+
+
+def helper_15(board, row):
+    """fn_14: any(board[row, :])"""
+    return bool(np.any(board[row, :]))
+
+
+def helper_16(rows):
+    """fn_15: all(rows == rows[0])"""
+    return bool(np.all(rows == rows[0]))
+
+
+def helper_17(ships, board):
+    """fn_16: any((ships > 0) & (board == -1))"""
+    return bool(np.any((ships > 0) & (board == -1)))
+
+
+def helper_18(cols):
+    """fn_17: all(cols == cols[0])"""
+    return bool(np.all(cols == cols[0]))
+
+
+def helper_19(board, row, col):
+    """fn_18: board[row, col] > 0"""
+    return np.greater(np.ascontiguousarray(board)[row, col], 0)
+
+
+def helper_20(board, col):
+    """fn_19: all(board[:, col] == board[0, col])"""
+    return bool(np.all(board[:, col] == board[0, col]))
+
+
+def helper_21(board, ships):
+    """fn_20: any((ships > 0) & (board == -1))"""
+    return bool(np.any((ships > 0) & (board == -1)))
+
+
+def helper_22(unrevealedships):
+    """fn_21: any(unrevealedships)"""
+    return bool(np.any(unrevealedships))
+
+
+def helper_23(a, b):
+    """fn_22: a | b"""
+    return np.logical_or(a, b)
+
+
+def helper_24(b, op, a):
+    """fn_23: all(op(a, b))"""
+    return bool(np.all(op(a, b)))
+
+
+def helper_25(hiddentiles, shiptiles):
+    """fn_24: any(shiptiles & hiddentiles)"""
+    return bool(np.any(np.logical_and(shiptiles, hiddentiles)))
+
+
+def helper_26(hiddenmask, shipmask):
+    """fn_25: any(shipmask & hiddenmask)"""
+    return bool(np.any(np.logical_and(shipmask, hiddenmask)))
+
+
+def helper_27(hiddenshiptiles):
+    """fn_26: any(hiddenshiptiles)"""
+    return bool(np.any(hiddenshiptiles))
+
+
+def helper_28(unrevealedshiptiles):
+    """fn_27: any(unrevealedshiptiles)"""
+    return bool(np.any(unrevealedshiptiles))
+
+
+def helper_29(hiddenshipmask):
+    """fn_28: any(hiddenshipmask)"""
+    return bool(np.any(hiddenshipmask))
+
+
+def helper_30(board, rowidx, colidx):
+    """fn_29: board[rowidx, colidx] > 0"""
+    return np.greater(np.ascontiguousarray(board)[rowidx, colidx], 0)
+
+
+def helper_31(col, board):
+    """fn_30: board[:, col]"""
+    return board[:, col]
+
+
+def helper_32(x):
+    """fn_31: any(x)"""
+    return bool(np.any(x))
+
+
+def helper_33(f, rows, cols):
+    """fn_32: len(f(cols)) == 1 and len(f(rows)) > 1"""
+    return len(f(cols)) == 1 and len(f(rows)) > 1
+
+
+def helper_34(a, b):
+    """fn_33: b & ~a"""
+    return np.logical_and(b, np.logical_not(a))
+
+
+def helper_35(shipmask, hiddenmask):
+    """fn_34: any(hiddenmask & shipmask)"""
+    return bool(np.any(np.logical_and(hiddenmask, shipmask)))
+
+
+def helper_36(a, b):
+    """fn_35: any(b & a)"""
+    return bool(np.any(np.logical_and(b, a)))
+
+
+def helper_37(row, col, board):
+    """fn_36: board[row, col] == -1"""
+    return np.equal(np.ascontiguousarray(board)[row, col], -1)
+
+
+def helper_38(board):
+    """fn_37: any(board[:, :])"""
+    return bool(np.any(board))
+
+
+def helper_39(x, i):
+    """fn_38: x[i]"""
+    return x[i]
+
+
+def helper_40(unrevealedship):
+    """fn_39: any(unrevealedship)"""
+    return bool(np.any(unrevealedship))
+
+
+def helper_41(board, row, col):
+    """fn_40: board[row, col] > 0"""
+    return np.greater(np.ascontiguousarray(board)[row, col], 0)
+
+
+def helper_42(unrevealedshipmask):
+    """fn_41: any(unrevealedshipmask)"""
+    return bool(np.any(unrevealedshipmask))
+
+
+def helper_43(hiddenships):
+    """fn_42: any(hiddenships)"""
+    return bool(np.any(hiddenships))
+
+
+def helper_44(board, rowidx, colidx):
+    """fn_43: board[rowidx, colidx] != 0"""
+    return np.not_equal(np.ascontiguousarray(board)[rowidx, colidx], 0)
+
+
+def helper_45(a, b):
+    """fn_44: b | a"""
+    return np.logical_or(b, a)
+
+
+def helper_46(x):
+    """fn_45: x == 1"""
+    return np.equal(x, 1)
+
+
+def helper_47(x):
+    """fn_46: x > 0"""
+    return np.greater(x, 0)
+
+
+def helper_48(x):
+    """fn_47: x > 1"""
+    return np.greater(x, 1)
+
+
+def helper_49(true_board, partial_board, row, col):
+    """fn_48: true_board[row, col] == -1 and partial_board[row, col] != 0"""
+    return np.logical_and(np.ascontiguousarray(true_board)[row, col] == -1,
+                          np.ascontiguousarray(partial_board)[row, col] != 0)
+
+
+def helper_50(x):
+    """fn_49: len(x)"""
+    return len(x)
+
+
+# Boards are tiny, so NumPy's per-call overhead dominates the hot
+# predicates. With numba they become early-exit scalar loops, compiled
+# lazily for whatever dtype and layout they are called with, so they
+# accept the same arrays as the NumPy versions they replace.
+if njit is not None:
+    @njit(cache=True)
+    def helper_16(rows):
+        """fn_15: all(rows == rows[0])"""
+        for i in range(1, rows.size):
+            if rows[i] != rows[0]:
+                return False
+        return True
+
+    @njit(cache=True)
+    def helper_17(ships, board):
+        """fn_16: any((ships > 0) & (board == -1))"""
+        # Flattened, so whole boards and single rows or columns both work
+        ship_cells, board_cells = ships.ravel(), board.ravel()
+        for i in range(ship_cells.size):
+            if ship_cells[i] > 0 and board_cells[i] == -1:
+                return True
+        return False
+
+    @njit(cache=True)
+    def helper_18(cols):
+        """fn_17: all(cols == cols[0])"""
+        for i in range(1, cols.size):
+            if cols[i] != cols[0]:
+                return False
+        return True
+
+    @njit(cache=True)
+    def helper_20(board, col):
+        """fn_19: all(board[:, col] == board[0, col])"""
+        for i in range(1, board.shape[0]):
+            if board[i, col] != board[0, col]:
+                return False
+        return True
 
+    @njit(cache=True)
+    def helper_21(board, ships):
+        """fn_20: any((ships > 0) & (board == -1))"""
+        # Flattened, so whole boards and single rows or columns both work
+        ship_cells, board_cells = ships.ravel(), board.ravel()
+        for i in range(ship_cells.size):
+            if ship_cells[i] > 0 and board_cells[i] == -1:
+                return True
+        return False
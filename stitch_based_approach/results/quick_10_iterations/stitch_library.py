@@ -1,94 +1,31 @@
 # Stitch-Discovered Helper Library
 # Auto-generated from compression results
-import numpy as np
+import functools
+import os
 
-def helper_1(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_0(#0) := (lam (lam (app tobool (app any #0))))
-    """
-    # TODO: Implement based on pattern
-    # fn_0(#0) := (lam (lam (app tobool (app any #0))))
-    pass
+# Patterns live in stitch_patterns.tsv (n<TAB>pattern) next to this file
+_PATTERNS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'stitch_patterns.tsv')
+NUM_HELPERS = 10
 
-def helper_2(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_1(#0,#1) := (app (app #1 #0))
-    """
-    # TODO: Implement based on pattern
-    # fn_1(#0,#1) := (app (app #1 #0))
-    pass
 
-def helper_3(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_2(#0) := (app all (fn_1 #0 eq (fn_1 #0 get 0)))
-    """
-    # TODO: Implement based on pattern
-    # fn_2(#0) := (app all (fn_1 #0 eq (fn_1 #0 get 0)))
-    pass
+@functools.lru_cache(maxsize=None)
+def _load_patterns():
+    with open(_PATTERNS_FILE) as f:
+        return {int(n): p for n, p in (line.rstrip('\n').split('\t', 1) for line in f)}
 
-def helper_4(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_3(#0,#1,#2) := (fn_1 #2 get (fn_1 #1 pair #0))
-    """
-    # TODO: Implement based on pattern
-    # fn_3(#0,#1,#2) := (fn_1 #2 get (fn_1 #1 pair #0))
-    pass
 
-def helper_5(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_4(#0,#1) := (fn_0 (fn_1 #1 and #0))
-    """
-    # TODO: Implement based on pattern
-    # fn_4(#0,#1) := (fn_0 (fn_1 #1 and #0))
-    pass
+def get_pattern(n):
+    """Return the Stitch pattern helper_n was discovered from."""
+    return _load_patterns()[n]
 
-def helper_6(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_5(#0,#1,#2) := (fn_1 (fn_3 #2 #1 0) #0 0)
-    """
-    # TODO: Implement based on pattern
-    # fn_5(#0,#1,#2) := (fn_1 (fn_3 #2 #1 0) #0 0)
-    pass
 
-def helper_7(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_6(#0) := (fn_1 #0 eq (app neg 1))
-    """
-    # TODO: Implement based on pattern
-    # fn_6(#0) := (fn_1 #0 eq (app neg 1))
-    pass
+def _make_helper(n):
+    def helper(*args):
+        pass
+    helper.__name__ = helper.__qualname__ = f"helper_{n}"
+    helper.__doc__ = f"Discovered by Stitch compression; see get_pattern({n})."
+    return helper
 
-def helper_8(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_7(#0) := (lam (lam (app tobool #0)))
-    """
-    # TODO: Implement based on pattern
-    # fn_7(#0) := (lam (lam (app tobool #0)))
-    pass
-
-def helper_9(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_8() := (app any)
-    """
-    # TODO: Implement based on pattern
-    # fn_8() := (app any)
-    pass
-
-def helper_10(*args):
-    """
-    Discovered by Stitch compression.
-    Pattern: fn_9(#0) := (fn_1 #0 and)
-    """
-    # TODO: Implement based on pattern
-    # fn_9(#0) := (fn_1 #0 and)
-    pass
 
+# TODO: Implement helpers based on their patterns
+globals().update({f"helper_{n}": _make_helper(n) for n in range(1, NUM_HELPERS + 1)})
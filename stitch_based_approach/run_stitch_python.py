@@ -2,15 +2,18 @@
 """
 Run Stitch compression using Python bindings.
 """
-import json
+import hashlib
+import os
+import pickle
 import stitch_core
 from typing import List, Dict, Any
 
+from json_io import dump_json, load_json, loads
+
 
 def load_programs(filename: str) -> List[str]:
     """Load programs from JSON file."""
-    with open(filename, 'r') as f:
-        data = json.load(f)
+    data = load_json(filename)
 
     if isinstance(data, list):
         # List of programs
@@ -22,6 +25,20 @@ def load_programs(filename: str) -> List[str]:
         raise ValueError(f"Unexpected format in {filename}")
 
 
+# Compression results are cached here, one pickle per distinct run
+STITCH_CACHE_DIR = '.stitch_cache'
+
+
+def stitch_cache_path(programs: List[str], max_arity: int, iterations: int, threads: int) -> str:
+    """Cache file for compressing these programs with these settings."""
+    version = getattr(stitch_core, '__version__', '')
+    h = hashlib.blake2b(f"{version}:{max_arity}:{iterations}:{threads}:".encode(), digest_size=16)
+    for program in programs:
+        h.update(program.encode())
+        h.update(b'\0')
+    return os.path.join(STITCH_CACHE_DIR, f"{h.hexdigest()}.pkl")
+
+
 def run_stitch(programs: List[str],
                max_arity: int = 3,
                iterations: int = 5,
@@ -44,6 +61,18 @@ def run_stitch(programs: List[str],
     print(f"  Threads: {threads}")
     print()
 
+    # Compression is deterministic in its inputs, so reuse an earlier run
+    cache_path = stitch_cache_path(programs, max_arity, iterations, threads)
+    try:
+        with open(cache_path, 'rb') as f:
+            result = pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError):
+        pass  # Missing or unreadable: compress again and rewrite it
+    else:
+        print(f"✓ Loaded cached compression result from {cache_path}")
+        print()
+        return result
+
     # Run compression
     result = stitch_core.compress(
         programs,
@@ -52,6 +81,20 @@ def run_stitch(programs: List[str],
         threads=threads
     )
 
+    # Write to a temporary file and swap it in, so an interrupted write
+    # never leaves a truncated cache file behind
+    os.makedirs(STITCH_CACHE_DIR, exist_ok=True)
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except (pickle.PicklingError, TypeError, AttributeError):
+        pass  # Not every stitch_core build returns a picklable result
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
     return result
 
 
@@ -64,7 +107,7 @@ def analyze_results(result: Any) -> Dict[str, Any]:
 
     # Get JSON representation
     if hasattr(result, 'json'):
-        result_dict = result.json if isinstance(result.json, dict) else json.loads(result.json)
+        result_dict = result.json if isinstance(result.json, dict) else loads(result.json)
     else:
         result_dict = {}
 
@@ -99,39 +142,61 @@ def analyze_results(result: Any) -> Dict[str, Any]:
 
 def save_results(result: Dict[str, Any], output_file: str):
     """Save results to JSON file."""
-    with open(output_file, 'w') as f:
-        json.dump(result, f, indent=2)
+    dump_json(result, output_file)
     print(f"✓ Results saved to {output_file}")
 
 
 def generate_python_library(result: Any, result_dict: Dict[str, Any], output_file: str):
-    """Generate Python helper library from abstractions."""
+    """Generate Python helper library from abstractions.
+
+    The patterns themselves are written to stitch_patterns.tsv next to the
+    library, which only reads them when get_pattern() is first called.
+    """
     abstractions = result.abstractions if hasattr(result, 'abstractions') else []
+    patterns_file = os.path.join(os.path.dirname(output_file), 'stitch_patterns.tsv')
 
-    code = "# Stitch-Discovered Helper Library\n"
-    code += "# Auto-generated from compression results\n"
-    code += "import numpy as np\n\n"
+    parts = [
+        "# Stitch-Discovered Helper Library\n",
+        "# Auto-generated from compression results\n",
+    ]
 
     if not abstractions:
-        code += "# No abstractions discovered\n"
+        parts.append("\n# No abstractions discovered\n")
     else:
-        for i, abstraction in enumerate(abstractions, 1):
-            name = f'helper_{i}'
-            abs_str = str(abstraction)
-
-            code += f"def {name}(*args):\n"
-            code += f'    """\n'
-            code += f'    Discovered by Stitch compression.\n'
-            code += f'    Pattern: {abs_str[:80]}{"..." if len(abs_str) > 80 else ""}\n'
-            code += f'    """\n'
-            code += f'    # TODO: Implement based on pattern\n'
-            code += f'    # {abs_str}\n'
-            code += f'    pass\n\n'
+        # One line per pattern, written straight to the file
+        with open(patterns_file, 'w') as f:
+            f.writelines(f"{i}\t{abstraction}\n" for i, abstraction in enumerate(abstractions, 1))
+
+        # One factory for every helper, rather than a def per helper
+        parts += [
+            "import functools\n",
+            "import os\n\n",
+            "# Patterns live in stitch_patterns.tsv (n<TAB>pattern) next to this file\n",
+            "_PATTERNS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'stitch_patterns.tsv')\n",
+            f"NUM_HELPERS = {len(abstractions)}\n\n\n",
+            "@functools.lru_cache(maxsize=None)\n",
+            "def _load_patterns():\n",
+            "    with open(_PATTERNS_FILE) as f:\n",
+            "        return {int(n): p for n, p in (line.rstrip('\\n').split('\\t', 1) for line in f)}\n\n\n",
+            "def get_pattern(n):\n",
+            '    """Return the Stitch pattern helper_n was discovered from."""\n',
+            "    return _load_patterns()[n]\n\n\n",
+            "def _make_helper(n):\n",
+            "    def helper(*args):\n",
+            "        pass\n",
+            '    helper.__name__ = helper.__qualname__ = f"helper_{n}"\n',
+            '    helper.__doc__ = f"Discovered by Stitch compression; see get_pattern({n})."\n',
+            "    return helper\n\n\n",
+            "# TODO: Implement helpers based on their patterns\n",
+            'globals().update({f"helper_{n}": _make_helper(n) for n in range(1, NUM_HELPERS + 1)})\n',
+        ]
 
     with open(output_file, 'w') as f:
-        f.write(code)
+        f.write("".join(parts))
 
     print(f"✓ Python library saved to {output_file}")
+    if abstractions:
+        print(f"✓ Helper patterns saved to {patterns_file}")
 
 
 def main():
@@ -159,7 +224,6 @@ def main():
 
     # Save outputs
     output_dir = f"stitch_output_python_iter_{iterations}"
-    import os
     os.makedirs(output_dir, exist_ok=True)
 
     save_results(result_dict, f"{output_dir}/results.json")
@@ -6,112 +6,213 @@ This creates a mapping from (program_id, canonical_var) → original_computation
 so we can reconstruct the full Python code after Stitch compression.
 """
 import ast
-import json
+import atexit
+import functools
+import hashlib
+import logging
+import os
+import pickle
 import re
-
-
-class VariableTracker(ast.NodeVisitor):
-    """Track all variable assignments in Python code."""
-
-    def __init__(self):
-        self.assignments = {}  # name -> ast expression
-        self.order = []  # Order of first appearance
-
-    def visit_Assign(self, node):
-        """Record variable assignments."""
-        for target in node.targets:
-            if isinstance(target, ast.Name):
-                self.assignments[target.id] = ast.unparse(node.value)
-                if target.id not in self.order:
-                    self.order.append(target.id)
-            elif isinstance(target, ast.Tuple):
-                # Tuple unpacking like: rows, _ = np.where(...)
-                if isinstance(node.value, ast.Call):
-                    # Store the call
-                    call_str = ast.unparse(node.value)
-                    for i, elt in enumerate(target.elts):
-                        if isinstance(elt, ast.Name):
-                            self.assignments[elt.id] = f"{call_str}[{i}]"
-                            if elt.id not in self.order:
-                                self.order.append(elt.id)
-        self.generic_visit(node)
-
-    def visit_For(self, node):
-        """Track for loop variables."""
-        if isinstance(node.target, ast.Name):
-            self.assignments[node.target.id] = "loop_variable"
-            if node.target.id not in self.order:
-                self.order.append(node.target.id)
-        self.generic_visit(node)
-
-
-def extract_variables_from_python(code: str) -> dict:
-    """Extract all variable assignments from Python code."""
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from json_io import dump_json, load_json, loads
+
+logger = logging.getLogger(__name__)
+
+# Free variables in the original and canonical Stitch programs
+_ORIG_VAR_RE = re.compile(r'\b[a-z_][a-z0-9_]+\b')
+_CANON_VAR_RE = re.compile(r'\bv\d+\b')
+
+# Stitch primitives that the original-variable pattern also matches
+_PRIMITIVES = frozenset({
+    'lam', 'app', 'any', 'all', 'sum', 'unique', 'where', 'argwhere',
+    'get', 'pair', 'slice', 'tobool', 'gt', 'lt', 'eq', 'ne', 'and', 'or'
+})
+
+
+def _walk_in_source_order(tree: ast.AST):
+    """
+    Yield every node of tree depth-first, in source order.
+
+    Unlike ast.walk (breadth-first), a later assignment at the top level
+    still overrides an earlier one nested inside a loop.
+    """
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        yield node
+        stack.extend(reversed(list(ast.iter_child_nodes(node))))
+
+
+def collect_assignments(tree: ast.AST):
+    """
+    Track all variable assignments (and for-loop targets) in a parsed module.
+
+    Returns name -> unparsed expression; keys keep insertion order, so
+    they list the names in order of first appearance.
+    """
+    assignments = {}
+
+    for node in _walk_in_source_order(tree):
+        if isinstance(node, ast.Assign):
+            # Unparse the value once, however many targets share it
+            val_str = ast.unparse(node.value)
+            for target in node.targets:
+                if isinstance(target, ast.Name):
+                    assignments[target.id] = val_str
+                elif isinstance(target, ast.Tuple):
+                    # Tuple unpacking like: rows, _ = np.where(...)
+                    if isinstance(node.value, ast.Call):
+                        # Store the call
+                        for i, elt in enumerate(target.elts):
+                            if isinstance(elt, ast.Name):
+                                assignments[elt.id] = f"{val_str}[{i}]"
+        elif isinstance(node, ast.For):
+            # Track for loop variables
+            if isinstance(node.target, ast.Name):
+                assignments[node.target.id] = "loop_variable"
+
+    return assignments
+
+
+# Extracted variables are also cached on disk across runs, keyed by a
+# fingerprint of the source. Bump CACHE_VERSION when collect_assignments changes
+# so stale entries are ignored.
+VAR_CACHE_FILE = '.var_cache.pkl'
+CACHE_VERSION = 2
+
+_var_cache = None  # Loaded on first use
+_var_cache_loaded_size = 0
+
+
+def cache_key(code: str) -> str:
+    """Fingerprint of a solution's source for the on-disk variable cache."""
+    digest = hashlib.blake2b(code.encode(), digest_size=16).hexdigest()
+    return f"{CACHE_VERSION}:{digest}"
+
+
+def _load_var_cache() -> dict:
+    """Return the on-disk variable cache, reading it the first time."""
+    global _var_cache, _var_cache_loaded_size
+    if _var_cache is None:
+        try:
+            with open(VAR_CACHE_FILE, 'rb') as f:
+                _var_cache = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            _var_cache = {}
+        _var_cache_loaded_size = len(_var_cache)
+        atexit.register(_save_var_cache)
+    return _var_cache
+
+
+def _save_var_cache():
+    """Write the variable cache back to disk if anything was added."""
+    if _var_cache is None or len(_var_cache) == _var_cache_loaded_size:
+        return
+    # Write to a temporary file and swap it in, so a concurrent run never
+    # reads a half-written cache
+    tmp_file = f"{VAR_CACHE_FILE}.{os.getpid()}.tmp"
+    with open(tmp_file, 'wb') as f:
+        pickle.dump(_var_cache, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_file, VAR_CACHE_FILE)
+
+
+@functools.lru_cache(maxsize=None)
+def extract_variables_from_python(code: str) -> tuple:
+    """
+    Extract all variable assignments from Python code.
+
+    Returns the (name, expression) pairs, in order of first appearance, as
+    a tuple so the cached result cannot be mutated; many programs share the
+    same source, which is only parsed once.
+    """
+    cache = _load_var_cache()
+    key = cache_key(code)
+    if key not in cache:
+        cache[key] = _extract_uncached(code)
+    return cache[key]
+
+
+def _extract_uncached(code: str) -> tuple:
+    """Parse code and collect its assignments, bypassing both caches."""
     try:
         tree = ast.parse(code)
-        tracker = VariableTracker()
-        tracker.visit(tree)
-        return {
-            'assignments': tracker.assignments,
-            'order': tracker.order
-        }
-    except:
-        return {'assignments': {}, 'order': []}
+    except (SyntaxError, ValueError) as e:  # ValueError: source with null bytes
+        logger.debug("Could not parse solution: %s", e)
+        return ()
+    return tuple(collect_assignments(tree).items())
+
+
+def prefetch_variables(codes):
+    """
+    Extract variables for every solution not yet in the on-disk cache.
+
+    Parsing is independent per program, so the unseen solutions
+    (deduplicated) are spread across worker processes; results are stored
+    in this process's cache, which is the one saved at exit.
+    """
+    cache = _load_var_cache()
+    pending = {}
+    for code in codes:
+        key = cache_key(code)
+        if key not in cache:
+            pending[key] = code
+    if not pending:
+        return
+
+    with ProcessPoolExecutor() as executor:
+        results = executor.map(_extract_uncached, pending.values(), chunksize=64)
+        for key, result in zip(pending, results):
+            cache[key] = result
+
+
+def iter_programs(filename: str = '../battleship_programs.jsonl'):
+    """Yield (index, entry) for each program in the JSONL file, one at a time."""
+    with open(filename, 'rb') as f:
+        for i, line in enumerate(f):
+            yield i, loads(line)
 
 
 def build_free_var_mapping():
     """Build mapping from canonical vars to original computations."""
 
-    # Load original Python programs
-    programs = []
-    with open('../battleship_programs.jsonl', 'r') as f:
-        for i, line in enumerate(f):
-            entry = json.loads(line)
-            programs.append({
-                'index': i,
-                'code': entry['solution'],
-                'name': entry['name']
-            })
-
     # Load the original (non-canonical) Stitch version to see original var names
-    with open('battleship_stitch_fixed.json') as f:
-        stitch_original = json.load(f)
+    stitch_original = load_json('battleship_stitch_fixed.json')
 
     # Load canonical version
-    with open('battleship_stitch_canonical.json') as f:
-        stitch_canonical = json.load(f)
+    stitch_canonical = load_json('battleship_stitch_canonical.json')
+
+    # Parse every uncached solution up front, in parallel
+    num_programs = min(len(stitch_original), len(stitch_canonical))
+    prefetch_variables(entry['solution'] for _, entry in islice(iter_programs(), num_programs))
 
     # Build mapping
     mapping = {}
 
-    for i, prog in enumerate(programs):
-        if i >= len(stitch_original):
-            break
-
+    # The original Python programs are streamed rather than loaded up front
+    for (i, entry), canonical, original in zip(iter_programs(), stitch_canonical, stitch_original):
         # Extract variables from Python
-        var_info = extract_variables_from_python(prog['code'])
-
-        # Extract free variables from both versions
-        orig_free_vars = set(re.findall(r'\b[a-z_][a-z0-9_]+\b', stitch_original[i]))
-        canon_free_vars = set(re.findall(r'\bv\d+\b', stitch_canonical[i]))
+        assignments = dict(extract_variables_from_python(entry['solution']))
 
-        # Remove primitives
-        primitives = {
-            'lam', 'app', 'any', 'all', 'sum', 'unique', 'where', 'argwhere',
-            'get', 'pair', 'slice', 'tobool', 'gt', 'lt', 'eq', 'ne', 'and', 'or'
+        # Extract free variables from both versions, skipping primitives
+        # as they are matched
+        orig_free_vars = {
+            m.group() for m in _ORIG_VAR_RE.finditer(original)
+            if m.group() not in _PRIMITIVES
         }
-        orig_free_vars = orig_free_vars - primitives
+        canon_free_vars = {m.group() for m in _CANON_VAR_RE.finditer(canonical)}
 
         if canon_free_vars:
             # Map canonical vars back to original vars
             var_mapping = {}
 
             # The order should match
-            orig_vars_ordered = [v for v in var_info['order'] if v in orig_free_vars]
+            orig_vars_ordered = [v for v in assignments if v in orig_free_vars]
             canon_vars_ordered = sorted(canon_free_vars)
 
             for j, (orig_var, canon_var) in enumerate(zip(orig_vars_ordered, canon_vars_ordered)):
-                computation = var_info['assignments'].get(orig_var, f"<unknown: {orig_var}>")
+                computation = assignments.get(orig_var, f"<unknown: {orig_var}>")
                 var_mapping[canon_var] = {
                     'original_name': orig_var,
                     'computation': computation
@@ -119,8 +220,8 @@ def build_free_var_mapping():
 
             if var_mapping:
                 mapping[i] = {
-                    'program_name': prog['name'],
-                    'canonical_program': stitch_canonical[i],
+                    'program_name': entry['name'],
+                    'canonical_program': canonical,
                     'variables': var_mapping
                 }
 
@@ -137,8 +238,7 @@ def main():
 
     # Save to JSON
     output_file = 'free_variable_mapping.json'
-    with open(output_file, 'w') as f:
-        json.dump(mapping, f, indent=2)
+    dump_json(mapping, output_file)
 
     print(f"✓ Saved mapping for {len(mapping)} programs to {output_file}")
     print()
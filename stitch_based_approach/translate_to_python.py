@@ -4,8 +4,11 @@ Translate Stitch abstractions back to Python code.
 
 This shows that the learned abstractions can be converted back to executable Python.
 """
-import json
 import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from json_io import load_json
 
 
 # Translation rules for Stitch primitives to Python
@@ -33,6 +36,206 @@ PRIMITIVE_TRANSLATIONS = {
     'len': 'len',
 }
 
+# Translated primitives that are written infix
+_OPERATORS = frozenset({'>', '<', '>=', '<=', '==', '!=', '&', '|', '+', '-', '*', '/'})
+
+# Output template per infix operator, applied to its (left) argument
+_OP_FMT = {op: f'({{}} {op})' for op in _OPERATORS}
+
+# Literal atoms with a direct Python spelling
+_ATOM_LITERALS = {'true': 'True', 'false': 'False'}
+
+# Atoms that need more than passing through: De Bruijn indices and
+# abstraction references. Numbers, free variables and anything else
+# unknown translate to themselves
+_ATOM_RE = re.compile(r'#(?P<index>\d+)|(?P<abstraction>fn_\w+)').fullmatch
+
+# Parens and atoms, skipping the spaces between them
+_TOKEN_RE = re.compile(r'[()]|[^\s()]+').finditer
+
+# Direct translations for the atoms that make up nearly every leaf: low
+# De Bruijn indices, low free variables, literals and primitives. Anything
+# else goes through the checks in the translator
+_ATOM_CACHE = {f'#{i}': f'arg{i}' for i in range(32)}
+_ATOM_CACHE.update({f'v{i}': f'v{i}' for i in range(64)})
+_ATOM_CACHE.update(_ATOM_LITERALS)
+_ATOM_CACHE.update(PRIMITIVE_TRANSLATIONS)
+
+
+def _build_lambda(parts: list) -> str:
+    """(lam body)"""
+    return f"lambda arg: {parts[0]}"
+
+
+def _build_passthrough(parts: list) -> str:
+    """(app f): a partial application translates to f itself."""
+    return parts[0]
+
+
+def _build_reference(parts: list) -> str:
+    """A bare fn_X reference, inlined as its parenthesized body."""
+    return f"({parts[0]})"
+
+
+def _build_application(parts: list) -> str:
+    """(app f x)"""
+    func, arg = parts
+
+    # Special handling for operators
+    fmt = _OP_FMT.get(func)
+    if fmt is not None:
+        return fmt.format(arg)
+
+    # Function application
+    return f"{func}({arg})"
+
+
+def _build_abstraction_call(parts: list) -> str:
+    """(fn_X args...): the abstraction applied to each arg in turn."""
+    # One join, rather than copying the growing call string per arg
+    return parts[0] + ''.join([f"({arg_py})" for arg_py in parts[1:]])
+
+
+def _build_sequence(parts: list) -> str:
+    """Any other list, translated element-wise."""
+    return f"({' '.join(parts)})"
+
+
+def make_translator(abstractions: dict = None):
+    """
+    Build a translator from Stitch s-expressions to Python code.
+
+    Translations are memoized per s-expression, so an abstraction that is
+    referenced from many bodies and programs is only translated once.
+    Each expression is translated in a single pass over its text.
+
+    Args:
+        abstractions: Dict mapping fn_X names to their bodies
+
+    Returns:
+        Function mapping an s-expression to a Python code string
+    """
+    # Whitespace is stripped once here and at the entry to translate();
+    # tokens never carry any, so nothing below strips again
+    abstractions = {name: body.strip() for name, body in (abstractions or {}).items()}
+
+    cache = {}
+
+    def translate(sexp: str) -> str:
+        """Translate sexp, reusing earlier results."""
+        sexp = sexp.strip()
+        if sexp not in cache:
+            cache[sexp] = _emit(sexp)
+        return cache[sexp]
+
+    # Translated abstraction bodies by name. An abstraction's body is fixed
+    # once the library is loaded, so it is specialized to its final Python
+    # text the first time it is referenced; every later fn_X reference is a
+    # single dict hit rather than another translation
+    abstraction_python = {}
+
+    def _abstraction(name: str):
+        """Translation of the body of abstraction name, or None if there is none."""
+        python = abstraction_python.get(name)
+        if python is None and name in abstractions:
+            python = abstraction_python[name] = translate(abstractions[name])
+        return python
+
+    def _atom(atom: str) -> str:
+        """Translate a single atom."""
+        # Common atoms, including every literal and primitive
+        hit = _ATOM_CACHE.get(atom)
+        if hit is not None:
+            return hit
+
+        # Classify the rest with a single match
+        match = _ATOM_RE(atom)
+        if match is not None:
+            # De Bruijn index
+            if match.lastgroup == 'index':
+                return f"arg{int(match['index'])}"
+
+            # Abstraction reference
+            python = _abstraction(atom)
+            if python is not None:
+                return _build_reference([python])
+
+        # Free variables (v0, v1, ...), numbers and anything else
+        return atom
+
+    def _build(sexp: str, children: list) -> str:
+        """Translate one list from its children's (start, end, python) spans."""
+        if not children:
+            return ""
+
+        op = sexp[children[0][0]:children[0][1]]
+        parts = [py for _, _, py in children]
+
+        # Lambda abstraction
+        if op == 'lam':
+            if len(children) == 2:
+                return _build_lambda(parts[1:])
+            # A malformed multi-token body is translated as the joined text
+            body = ' '.join(sexp[start:end] for start, end, _ in children[1:])
+            return _build_lambda([translate(body)])
+
+        # Application
+        if op == 'app':
+            if len(children) == 2:
+                # Partial application
+                return _build_passthrough(parts[1:])
+            elif len(children) == 3:
+                return _build_application(parts[1:])
+
+        # Abstraction reference
+        if op.startswith('fn_'):
+            head = _abstraction(op)
+            return _build_abstraction_call([op if head is None else head, *parts[1:]])
+
+        return _build_sequence(parts)
+
+    def _emit(sexp: str) -> str:
+        """
+        Translate a stripped s-expression in one left-to-right pass.
+
+        Tokens come straight from one regex scan of the whole string, and
+        each list is translated as soon as its close paren is reached, from
+        its children's translations. No sub-expression is sliced out and
+        rescanned, and nesting costs no Python frames: open lists live on an
+        explicit stack. Only abstraction bodies recurse, through the cache.
+        """
+        if not sexp.startswith('('):
+            return _atom(sexp)
+
+        # One (start, children) entry per open list; children are
+        # (start, end, python) spans
+        stack = []
+        for match in _TOKEN_RE(sexp):
+            token = match.group()
+            if token == '(':
+                stack.append((match.start(), []))
+            elif token == ')':
+                if not stack:
+                    continue  # Stray close paren
+                start, children = stack.pop()
+                python = _build(sexp, children)
+                if not stack:
+                    return python
+                stack[-1][1].append((start, match.end(), python))
+            elif stack:
+                stack[-1][1].append((match.start(), match.end(), _atom(sys.intern(token))))
+
+        # Unbalanced: close whatever is still open
+        python = ""
+        while stack:
+            start, children = stack.pop()
+            python = _build(sexp, children)
+            if stack:
+                stack[-1][1].append((start, len(sexp), python))
+        return python
+
+    return translate
+
 
 def translate_to_python(sexp: str, abstractions: dict = None) -> str:
     """
@@ -45,200 +248,123 @@ def translate_to_python(sexp: str, abstractions: dict = None) -> str:
     Returns:
         Python code string
     """
-    if abstractions is None:
-        abstractions = {}
-
-    # Parse the s-expression
-    sexp = sexp.strip()
+    return make_translator(abstractions)(sexp)
 
-    # Handle atoms (variables, numbers, primitives)
-    if not sexp.startswith('('):
-        # De Bruijn index
-        if sexp.startswith('#'):
-            idx = int(sexp[1:])
-            return f"arg{idx}"
 
-        # Free variable
-        if sexp.startswith('v'):
-            return sexp  # Keep as v0, v1, etc.
+# Below this many characters of abstraction bodies in total, translating
+# in-process beats starting a worker pool
+_PARALLEL_MIN_CHARS = 50_000
 
-        # Number
-        if sexp.isdigit() or (sexp.startswith('-') and sexp[1:].isdigit()):
-            return sexp
+# Each worker process builds one translator for the whole library, so
+# shared abstractions are only translated once per worker
+_worker_translate = None
 
-        # Boolean
-        if sexp == 'true':
-            return 'True'
-        if sexp == 'false':
-            return 'False'
 
-        # Primitive
-        if sexp in PRIMITIVE_TRANSLATIONS:
-            return PRIMITIVE_TRANSLATIONS[sexp]
-
-        # Abstraction reference
-        if sexp.startswith('fn_'):
-            if sexp in abstractions:
-                return f"({translate_to_python(abstractions[sexp], abstractions)})"
-            return sexp
-
-        return sexp
-
-    # Parse compound expression
-    tokens = tokenize(sexp)
-
-    if not tokens:
-        return ""
-
-    op = tokens[0]
-
-    # Lambda abstraction
-    if op == 'lam':
-        body = ' '.join(tokens[1:])
-        return f"lambda arg: {translate_to_python(body, abstractions)}"
-
-    # Application
-    if op == 'app':
-        if len(tokens) == 2:
-            # Partial application
-            return translate_to_python(tokens[1], abstractions)
-        elif len(tokens) == 3:
-            func = translate_to_python(tokens[1], abstractions)
-            arg = translate_to_python(tokens[2], abstractions)
-
-            # Special handling for operators
-            if func in ['>', '<', '>=', '<=', '==', '!=', '&', '|', '+', '-', '*', '/']:
-                return f"({arg} {func})"
-
-            # Function application
-            return f"{func}({arg})"
-
-    # Abstraction reference
-    if op.startswith('fn_'):
-        # Apply the abstraction to remaining args
-        abs_body = abstractions.get(op, op)
-        result = translate_to_python(abs_body, abstractions)
-
-        # Apply to arguments
-        for arg in tokens[1:]:
-            arg_py = translate_to_python(arg, abstractions)
-            result = f"{result}({arg_py})"
-
-        return result
-
-    return f"({' '.join(translate_to_python(t, abstractions) for t in tokens)})"
-
-
-def tokenize(sexp: str) -> list:
-    """Simple tokenizer for s-expressions."""
-    sexp = sexp.strip()
-    if not sexp.startswith('('):
-        return [sexp]
-
-    # Remove outer parens
-    sexp = sexp[1:-1]
-
-    tokens = []
-    current = ""
-    depth = 0
-
-    for char in sexp:
-        if char == '(':
-            depth += 1
-            current += char
-        elif char == ')':
-            depth -= 1
-            current += char
-        elif char == ' ' and depth == 0:
-            if current:
-                tokens.append(current)
-                current = ""
-        else:
-            current += char
+def _init_worker(abstractions: dict):
+    """Build this process's translator for the abstraction library."""
+    global _worker_translate
+    _worker_translate = make_translator(abstractions)
 
-    if current:
-        tokens.append(current)
 
-    return tokens
+def _translate_one(body: str):
+    """Translate one abstraction body; returns (python, error message)."""
+    try:
+        return _worker_translate(body), None
+    except Exception as e:
+        return None, str(e)
 
 
 def main():
     """Translate some example abstractions and programs."""
 
+    # Output is collected here and written in one go at the end
+    out = []
+
     # Load results
-    with open('results/canonical_100_iterations/results.json') as f:
-        results = json.load(f)
+    results_file = 'results/canonical_100_iterations/results.json'
+    results = load_json(results_file)
 
     # Build abstraction dictionary
-    abstractions = {}
-    for abs_info in results['abstractions']:
-        abstractions[abs_info['name']] = abs_info['body']
+    abstraction_list = results['abstractions']
+    abstractions = {abs_info['name']: abs_info['body'] for abs_info in abstraction_list}
 
-    print("=" * 80)
-    print("TRANSLATING STITCH ABSTRACTIONS TO PYTHON")
-    print("=" * 80)
-    print()
+    out.append("=" * 80 + "\n")
+    out.append("TRANSLATING STITCH ABSTRACTIONS TO PYTHON\n")
+    out.append("=" * 80 + "\n")
+    out.append("\n")
 
     # Translate top abstractions
-    print("Top 10 Abstractions:")
-    print()
-
-    for i, abs_info in enumerate(results['abstractions'][:10], 1):
+    out.append("Top 10 Abstractions:\n")
+    out.append("\n")
+
+    # The top abstractions are independent, so large ones are translated
+    # across worker processes; small ones are not worth the pool start-up
+    top = abstraction_list[:10]
+    bodies = [abs_info['body'] for abs_info in top]
+    if sum(map(len, bodies)) >= _PARALLEL_MIN_CHARS:
+        with ProcessPoolExecutor(initializer=_init_worker, initargs=(abstractions,)) as executor:
+            translations = list(executor.map(_translate_one, bodies))
+    else:
+        _init_worker(abstractions)
+        translations = [_translate_one(body) for body in bodies]
+
+    for i, (abs_info, (python, error)) in enumerate(zip(top, translations), 1):
         name = abs_info['name']
         body = abs_info['body']
 
-        # Try to translate (may not be perfect for complex ones)
-        try:
-            python = translate_to_python(body, abstractions)
-            print(f"{i:2}. {name}: {abs_info['num_uses']} uses")
-            print(f"    Stitch: {body}")
-            print(f"    Python: {python}")
-            print()
-        except Exception as e:
-            print(f"{i:2}. {name}: (translation error: {e})")
-            print()
-
-    print("=" * 80)
-    print("EXAMPLE: Translating Compressed Programs")
-    print("=" * 80)
-    print()
+        # Translation may not be perfect for complex ones
+        if error is None:
+            out.append(f"{i:2}. {name}: {abs_info['num_uses']} uses\n")
+            out.append(f"    Stitch: {body}\n")
+            out.append(f"    Python: {python}\n")
+            out.append("\n")
+        else:
+            out.append(f"{i:2}. {name}: (translation error: {error})\n")
+            out.append("\n")
+
+    out.append("=" * 80 + "\n")
+    out.append("EXAMPLE: Translating Compressed Programs\n")
+    out.append("=" * 80 + "\n")
+    out.append("\n")
 
     # Show some rewritten programs
-    print("These programs were compressed using the learned abstractions:")
-    print()
+    out.append("These programs were compressed using the learned abstractions:\n")
+    out.append("\n")
 
     for i in [12, 14, 16]:
         original = results['original'][i]
         rewritten = results['rewritten'][i]
 
-        print(f"Program {i}:")
-        print(f"  Original:  {original}")
-        print(f"  Rewritten: {rewritten}")
+        out.append(f"Program {i}:\n")
+        out.append(f"  Original:  {original}\n")
+        out.append(f"  Rewritten: {rewritten}\n")
 
         # Translate the rewritten version
         if rewritten in abstractions:
             expanded = abstractions[rewritten]
-            print(f"  Expanded:  {expanded}")
-
-        print()
-
-    print("=" * 80)
-    print("NOTES ON TRANSLATION")
-    print("=" * 80)
-    print()
-    print("1. Free variables (v0, v1, etc.) represent intermediate computations")
-    print("   that need to be provided when using the abstraction")
-    print()
-    print("2. De Bruijn indices (#0, #1) are lambda parameters - translate to")
-    print("   actual parameter names in the lambda")
-    print()
-    print("3. The abstractions form a LIBRARY of reusable patterns that can be")
-    print("   composed together to build complex programs")
-    print()
-    print("4. Full reconstruction would require:")
-    print("   - Tracking what v0, v1, etc. represent in each program")
-    print("   - Inlining all abstraction definitions")
-    print("   - Converting lambda calculus to imperative Python")
+            out.append(f"  Expanded:  {expanded}\n")
+
+        out.append("\n")
+
+    out.append("=" * 80 + "\n")
+    out.append("NOTES ON TRANSLATION\n")
+    out.append("=" * 80 + "\n")
+    out.append("\n")
+    out.append("1. Free variables (v0, v1, etc.) represent intermediate computations\n")
+    out.append("   that need to be provided when using the abstraction\n")
+    out.append("\n")
+    out.append("2. De Bruijn indices (#0, #1) are lambda parameters - translate to\n")
+    out.append("   actual parameter names in the lambda\n")
+    out.append("\n")
+    out.append("3. The abstractions form a LIBRARY of reusable patterns that can be\n")
+    out.append("   composed together to build complex programs\n")
+    out.append("\n")
+    out.append("4. Full reconstruction would require:\n")
+    out.append("   - Tracking what v0, v1, etc. represent in each program\n")
+    out.append("   - Inlining all abstraction definitions\n")
+    out.append("   - Converting lambda calculus to imperative Python\n")
+
+    sys.stdout.write(''.join(out))
 
 
 if __name__ == '__main__':